@@ -36,23 +36,25 @@ from adjacency_matrix_graph import AdjacencyMatrixGraph
 
 class Edge:
 
+	# Fixed attribute slots instead of a per-object dictionary keep each edge small.
+	__slots__ = ("v", "weight")
+
 	def __init__(self, v, weight=None):
 		"""Initialize an edge to add to the adjacency list of another vertex.
 
 		Arguments:
 		v -- the other vertex that the edge is incident on
-		weight -- optional parameter for weighted graphs
+		weight -- optional parameter for weighted graphs, None if unweighted
 		"""
 		self.v = v
-		if weight is not None:
-			self.weight = weight
+		self.weight = weight
 
 	def get_v(self):
 		"""Return the vertex index."""
 		return self.v
 
 	def get_weight(self):
-		"""Return the weight of this edge."""
+		"""Return the weight of this edge, None if unweighted."""
 		return self.weight
 
 	def set_weight(self, weight):
@@ -67,14 +69,14 @@ class Edge:
 		"""String version of the vertex with optional weight in parentheses.
 		Vertex numbers are mapped according to a mapping function."""
 		string = str(mapping_func(self.v))
-		if hasattr(self, "weight"):
+		if self.weight is not None:
 			string += " (" + str(self.weight) + ")"
 		return string
 
 
 class AdjacencyListGraph:
 
-	def __init__(self, card_V, directed=True, weighted=False):
+	def __init__(self, card_V, directed=True, weighted=False, indexed=False):
 		"""Initialize a graph implemented by an adjacency list. Vertices are
 		numbered from 0, so that adj_list[i] corresponds to adjacency list of vertex i.
 
@@ -82,6 +84,8 @@ class AdjacencyListGraph:
 		card_V -- number of vertices in this graph
 		directed -- boolean indicating whether the graph is directed
 		weighted -- boolean indicating whether edges are weighted
+		indexed -- boolean indicating whether to keep a hashed index of the edges,
+		so that find_edge and has_edge take constant time instead of searching a list
 		"""
 		self.directed = directed
 		self.weighted = weighted
@@ -89,6 +93,8 @@ class AdjacencyListGraph:
 		for i in range(card_V):
 			# Each adjacency list is implemented as a linked list.
 			self.adj_lists[i] = DLLSentinel(get_key_func=Edge.get_v)  # will be a list of Edge objects
+		# edge_index[u] maps each vertex v adjacent to u to the Edge object for (u, v).
+		self.edge_index = [{} for i in range(card_V)] if indexed else None
 		self.card_V = card_V
 		self.card_E = 0
 
@@ -108,6 +114,11 @@ class AdjacencyListGraph:
 		"""Return an iterator for the adjacency list of vertex u."""
 		return self.adj_lists[u].iterator()
 
+	def get_neighbors(self, u):
+		"""Return an iterator of (v, weight) pairs for the edges leaving vertex u.
+		Weights are None in an unweighted graph."""
+		return ((edge.v, edge.weight) for edge in self.adj_lists[u].iterator())
+
 	def is_directed(self):
 		"""Return a boolean indicating whether this graph is directed."""
 		return self.directed
@@ -116,6 +127,10 @@ class AdjacencyListGraph:
 		"""Return a boolean indicating whether this graph is weighted."""
 		return self.weighted
 
+	def is_indexed(self):
+		"""Return a boolean indicating whether this graph keeps a hashed edge index."""
+		return self.edge_index is not None
+
 	def insert_edge(self, u, v, weight=None):
 		"""Insert an edge between vertices u and v.
 
@@ -138,7 +153,10 @@ class AdjacencyListGraph:
 		# Cannot insert multiple edges between two vertices.
 		if self.has_edge(u, v):
 			raise RuntimeError("An edge (" + str(u) + ", " + str(v) + ") already exists.")
-		self.adj_lists[u].append(Edge(v, weight))
+		edge = Edge(v, weight)
+		self.adj_lists[u].append(edge)
+		if self.edge_index is not None:
+			self.edge_index[u][v] = edge
 		self.card_E += 1
 
 		# If this graph is undirected, insert an edge from v to u.
@@ -146,10 +164,15 @@ class AdjacencyListGraph:
 			# Cannot insert multiple edges between two vertices.
 			if self.has_edge(v, u):
 				raise RuntimeError("An edge (" + str(v) + ", " + str(u) + ") already exists.")
-			self.adj_lists[v].append(Edge(u, weight))
+			edge = Edge(u, weight)
+			self.adj_lists[v].append(edge)
+			if self.edge_index is not None:
+				self.edge_index[v][u] = edge
 
 	def find_edge(self, u, v):
 		"""Return the edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
+		if self.edge_index is not None:
+			return self.edge_index[u].get(v)
 		edge = self.adj_lists[u].search(v)
 		if edge is None:
 			return None
@@ -158,29 +181,57 @@ class AdjacencyListGraph:
 
 	def has_edge(self, u, v):
 		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		if self.edge_index is not None:
+			return v in self.edge_index[u]
 		return self.find_edge(u, v) is not None
 
+	def set_edge_weight(self, u, v, weight):
+		"""Change the weight of edge (u, v), in both directions if the graph is undirected."""
+		edge = self.find_edge(u, v)
+		if edge is None:
+			raise RuntimeError("There is no edge (" + str(u) + ", " + str(v) + ").")
+		edge.set_weight(weight)
+		if not self.directed:
+			self.find_edge(v, u).set_weight(weight)
+
 	def delete_edge(self, u, v, delete_undirected=True):
 		"""Delete edge (u, v) if it exists.  No error if it does not exist.
 			Delete both directions if the graph is undirected and delete_undirected is True."""
-		edge = self.adj_lists[u].search(v)
-		if edge is not None:
-			self.adj_lists[u].delete(edge)
-			self.card_E -= 1
+		# With an index there is no need to search the list when the edge is absent.
+		if self.edge_index is None or v in self.edge_index[u]:
+			edge = self.adj_lists[u].search(v)
+			if edge is not None:
+				self.adj_lists[u].delete(edge)
+				self.card_E -= 1
+				if self.edge_index is not None:
+					del self.edge_index[u][v]
 
 		if not self.directed and delete_undirected:
-			edge = self.adj_lists[v].search(u)
-			if edge is not None:
-				self.adj_lists[v].delete(edge)
+			if self.edge_index is None or u in self.edge_index[v]:
+				edge = self.adj_lists[v].search(u)
+				if edge is not None:
+					self.adj_lists[v].delete(edge)
+					if self.edge_index is not None:
+						del self.edge_index[v][u]
 
 	def copy(self):
-		"""Return a copy of this graph."""
-		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		"""Return a copy of this graph.  The copy has its own Edge objects, so that
+		changing a weight in one graph does not change it in the other."""
+		copy = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.is_indexed())
 		copy.card_E = self.card_E
 		for u in range(self.card_V):
-			copy.adj_lists[u] = self.adj_lists[u].copy()
+			for v, weight in self.get_neighbors(u):
+				edge = Edge(v, weight)
+				copy.adj_lists[u].append(edge)
+				if copy.edge_index is not None:
+					copy.edge_index[u][v] = edge
 		return copy
 
+	def freeze(self):
+		"""Return a read-only copy of this graph in compressed sparse row form."""
+		from csr_graph import CSRGraph
+		return CSRGraph.from_graph(self)
+
 	def get_edge_list(self):
 		"""Return a Python list containing the edges of this graph."""
 		edge_list = []
@@ -194,7 +245,7 @@ class AdjacencyListGraph:
 
 	def transpose(self):
 		"""Return the transpose of this graph."""
-		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		xpose = AdjacencyListGraph(self.card_V, self.directed, self.weighted, self.is_indexed())
 		for u in range(self.card_V):
 			adj_list = self.get_adj_list(u)
 			for edge in adj_list:
@@ -311,3 +362,54 @@ if __name__ == "__main__":
 	# Test transpose.
 	xpose1 = graph1.transpose()
 	print(xpose1)
+
+	# Indexed graphs must behave the same as unindexed ones.
+	graph4 = AdjacencyListGraph(10, directed=False, weighted=True, indexed=True)
+	graph5 = AdjacencyListGraph(10, directed=False, weighted=True)
+	for i in range(0, len(array1) - 1, 2):
+		for graph in (graph4, graph5):
+			try:
+				graph.insert_edge(array1[i], array1[i + 1], array1[i + 1])
+			except RuntimeError as e:
+				pass
+	graph6 = graph4.copy()
+	for u, v in graph4.get_edge_list()[:2]:
+		graph4.delete_edge(u, v)
+		graph5.delete_edge(u, v)
+	print(str(graph4) == str(graph5), graph4.get_card_E() == graph5.get_card_E())
+	print(all(graph4.has_edge(u, v) == graph5.has_edge(u, v) for u in range(10) for v in range(10)))
+	u, v = graph6.get_edge_list()[0]
+	graph6.set_edge_weight(u, v, 100)
+	print(graph6.find_edge(v, u).get_weight() == 100, graph4.find_edge(u, v) is None or graph4.find_edge(u, v).get_weight() != 100)
+
+	# Bulk construction with and without the index.
+	import time
+	edges = [(u, v) for u in range(2000) for v in np.random.choice(2000, 50, replace=False) if u != v]
+	for indexed in (False, True):
+		start = time.perf_counter()
+		graph7 = AdjacencyListGraph(2000, indexed=indexed)
+		for u, v in edges:
+			if not graph7.has_edge(u, v):
+				graph7.insert_edge(u, v)
+		print("indexed=%s: %.3f s" % (indexed, time.perf_counter() - start))
+
+	# Per-edge memory of slotted Edge objects, compared with the same class using a __dict__.
+	import sys
+	import tracemalloc
+
+	class DictEdge:
+		def __init__(self, v, weight=None):
+			self.v = v
+			if weight is not None:
+				self.weight = weight
+
+	count = 100000
+	for edge_class in (DictEdge, Edge):
+		tracemalloc.start()
+		edges = [edge_class(i, i + 0.5) for i in range(count)]
+		size, peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+		# Subtract the list itself and the float weights, which both classes share.
+		per_edge = (size - sys.getsizeof(edges) - count * sys.getsizeof(0.5)) / count
+		print("%s: %.0f bytes per edge, getsizeof %d" % (edge_class.__name__, per_edge, sys.getsizeof(edges[0])))
+		del edges
@@ -30,8 +30,14 @@
 #                                                                       #
 #########################################################################
 
+from array import array
+
 import numpy as np
 
+from csr_graph import CSRGraph, weight_array
+from bellman_ford import bellman_ford_queue
+from dijkstra import dijkstra
+
 
 def extend_shortest_paths(L_r_minus_1, W, L_r, n):
 	"""Extend the shortest paths given in one matrix by the edge
@@ -45,9 +51,8 @@ def extend_shortest_paths(L_r_minus_1, W, L_r, n):
 	n -- each matrix is n x n
 	"""
 	for i in range(n):
-		for j in range(n):
-			for k in range(n):
-				L_r[i, j] = min(L_r[i, j], L_r_minus_1[i, k] + W[k, j])
+		# Row i of the min-plus product: L_r[i, j] = min over k of L_r_minus_1[i, k] + W[k, j].
+		np.minimum(L_r[i], (L_r_minus_1[i, :, np.newaxis] + W).min(axis=0), out=L_r[i])
 
 
 def slow_apsp(W, L_0, n):
@@ -92,6 +97,49 @@ def faster_apsp(W, n):
 	return L
 
 
+def floyd_warshall(W):
+	"""Compute all-pairs shortest paths and predecessors with the Floyd-Warshall
+	algorithm.  Each of the n iterations updates the whole distance matrix at once
+	with NumPy broadcasting, rather than looping over vertex pairs.
+
+	Arguments:
+	W -- the weighted adjacency matrix for the graph, with 0 on the diagonal and
+	infinity where there is no edge
+	Assumption:
+	No negative-weight cycles
+	Returns:
+	D -- matrix of shortest-path weights, where D[i,j] is the weight of a
+	shortest path from vertex i to vertex j
+	Pi -- predecessor matrix, where Pi[i,j] is the vertex before j on a shortest
+	path from i to j, or -1 if i == j or there is no path
+	"""
+	n = W.shape[0]
+	D = np.array(W, dtype=float)
+	Pi = np.where(np.isfinite(D), np.arange(n)[:, np.newaxis], -1)
+	np.fill_diagonal(Pi, -1)
+
+	for k in range(n):
+		# Paths that go through vertex k, for every pair at once.
+		through_k = D[:, k, np.newaxis] + D[np.newaxis, k, :]
+		shorter = through_k < D
+		D[shorter] = through_k[shorter]
+		# The predecessor of j on a path through k is its predecessor on the path from k.
+		Pi = np.where(shorter, Pi[k], Pi)
+	return D, Pi
+
+
+def create_weight_matrix(G):
+	"""Create and return the W matrix for a graph G represented by adjacency lists,
+	with 0 on the diagonal and infinity where there is no edge."""
+	n = G.get_card_V()
+	W = np.full((n, n), float('inf'))
+	for u in range(n):
+		for v, weight in G.get_neighbors(u):
+			W[u, v] = min(W[u, v], weight)
+	np.fill_diagonal(W, 0)
+	return W
+
+
 def initialize_L_0(n):
 	"""Create and return the L_0 matrix, with 0 on the diagonal and infinity everywhere else."""
 	L_0 = np.ndarray((n,n))
@@ -109,6 +157,58 @@ def create_W(G, n):
 	return W
 
 
+def johnson(G):
+	"""Compute all-pairs shortest paths and predecessors of a sparse graph, which may
+	have negative-weight edges, with Johnson's algorithm.  Bellman-Ford from an
+	added vertex q, with a 0-weight edge to every vertex, gives potentials h.
+	Reweighting each edge (u, v) by h[u] - h[v] makes every weight nonnegative
+	without changing which paths are shortest, so that Dijkstra's algorithm can
+	run from each vertex.  Takes O(V E lg V) time.
+
+	Arguments:
+	G -- a directed, weighted graph
+	Returns:
+	D -- matrix of shortest-path weights, where D[i,j] is the weight of a
+	shortest path from vertex i to vertex j
+	Pi -- predecessor matrix, where Pi[i,j] is the vertex before j on a shortest
+	path from i to j, or -1 if i == j or there is no path
+	"""
+	if not G.is_weighted():
+		raise RuntimeError("Johnson's algorithm needs a weighted graph.")
+	n = G.get_card_V()
+	csr = CSRGraph.from_graph(G)
+
+	# G' has vertex q = n, with an edge of weight 0 to every other vertex.  An
+	# undirected edge appears once in each direction, which G' keeps as two directed edges.
+	weights = csr.weights
+	offsets_prime = array("q", csr.offsets)
+	offsets_prime.append(csr.offsets[-1] + n)
+	targets_prime = array("q", csr.targets)
+	targets_prime.extend(range(n))
+	G_prime = CSRGraph(n + 1, offsets_prime, targets_prime,
+					   weight_array(list(weights) + [0] * n), directed=True)
+	h, _, no_negative_cycle = bellman_ford_queue(G_prime, n)
+	if not no_negative_cycle:
+		raise RuntimeError("The input graph contains a negative-weight cycle.")
+
+	# Reweight the edges of G.
+	reweighted = []
+	for u in range(n):
+		for i in range(csr.offsets[u], csr.offsets[u + 1]):
+			reweighted.append(weights[i] + h[u] - h[csr.targets[i]])
+	G_hat = CSRGraph(n, csr.offsets, csr.targets, weight_array(reweighted), directed=True)
+
+	D = np.empty((n, n), dtype=float)
+	Pi = np.empty((n, n), dtype=np.int64)
+	h_array = np.array(h[:n], dtype=float)
+	for u in range(n):
+		d_hat, pi = dijkstra(G_hat, u, engine="lazy")
+		# Undo the reweighting: a path from u to v changed weight by h[u] - h[v].
+		D[u] = np.array(d_hat, dtype=float) + h_array - h[u]
+		Pi[u] = [-1 if p is None else p for p in pi]
+	return D, Pi
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -131,6 +231,10 @@ if __name__ == "__main__":
 	faster_L = faster_apsp(W, n)
 	print(faster_L)
 	print(np.array_equal(slow_L, faster_L))
+	D, Pi = floyd_warshall(W)
+	print(D)
+	print(Pi)
+	print(np.array_equal(slow_L, D))
 	print()
 
 	# Larger example.
@@ -145,3 +249,83 @@ if __name__ == "__main__":
 	faster_L = faster_apsp(W, n)
 	print(faster_L)
 	print(np.array_equal(slow_L, faster_L))
+	D, Pi = floyd_warshall(W)
+	print(np.array_equal(slow_L, D))
+
+	# Floyd-Warshall on adjacency lists should agree with dijkstra, distances and paths.
+	from dijkstra import dijkstra
+	graph3 = generate_random_graph(n, 0.08, True, True, True, 0, 15)
+	D, Pi = floyd_warshall(create_weight_matrix(graph3))
+	all_equal = True
+	for s in range(n):
+		d, pi = dijkstra(graph3, s)
+		if not np.array_equal(D[s], np.array(d, dtype=float)):
+			all_equal = False
+		for t in range(n):
+			# Walk the predecessors back from t, adding up edge weights.
+			length = 0
+			v = t
+			while Pi[s, v] != -1:
+				length += graph3.find_edge(Pi[s, v], v).get_weight()
+				v = Pi[s, v]
+			if np.isfinite(D[s, t]) and (v != s or length != D[s, t]):
+				all_equal = False
+	print("Floyd-Warshall " + ("agrees" if all_equal else "does not agree") + " with dijkstra")
+
+	# Johnson's algorithm with negative weights should agree with Floyd-Warshall.
+	import random
+	all_equal = True
+	for trial in range(10):
+		graph4 = generate_random_graph(n, 0.08, True, True, True, 0, 15)
+		# Shifting by potentials makes some weights negative without creating negative cycles.
+		potential = [random.randint(-10, 10) for v in range(n)]
+		for u in range(n):
+			for edge in graph4.get_adj_list(u):
+				edge.set_weight(edge.get_weight() + potential[u] - potential[edge.get_v()])
+		D, Pi = johnson(graph4)
+		D_fw, Pi_fw = floyd_warshall(create_weight_matrix(graph4))
+		if not np.array_equal(D, D_fw):
+			all_equal = False
+		for s in range(n):
+			for t in range(n):
+				length = 0
+				v = t
+				while Pi[s, v] != -1:
+					length += graph4.find_edge(Pi[s, v], v).get_weight()
+					v = Pi[s, v]
+				if np.isfinite(D[s, t]) and (v != s or length != D[s, t]):
+					all_equal = False
+	print("Johnson " + ("agrees" if all_equal else "does not agree") + " with Floyd-Warshall")
+
+	# A negative-weight cycle is reported.
+	graph4.delete_edge(0, 1)
+	graph4.delete_edge(1, 0)
+	graph4.insert_edge(0, 1, -1000)
+	graph4.insert_edge(1, 0, 0)
+	try:
+		johnson(graph4)
+		print("Negative-weight cycle not detected")
+	except RuntimeError as error:
+		print(error)
+
+	# An unweighted graph is rejected instead of being given weights of 0.
+	try:
+		johnson(generate_random_graph(6, 0.5, True, True, False))
+		print("Unweighted graph accepted")
+	except RuntimeError as error:
+		print(error)
+
+	# Timing on the Underground network.
+	import time
+	from bellman_ford import bellman_ford
+	from adjacency_list_graph import AdjacencyListGraph
+	from underground_data import load_network, insert_network_edges
+	stations, edges = load_network()
+	graph5 = AdjacencyListGraph(len(stations), directed=False, weighted=True)
+	insert_network_edges(graph5, edges)
+	for name, solve in (("Johnson", lambda: johnson(graph5)),
+						("Floyd-Warshall", lambda: floyd_warshall(create_weight_matrix(graph5))),
+						("Bellman-Ford per source", lambda: [bellman_ford(graph5, s) for s in range(len(stations))])):
+		start = time.perf_counter()
+		solve()
+		print("%s: %.3f s" % (name, time.perf_counter() - start))
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# alt_search.py
+
+import heapq
+
+import numpy as np
+
+from dijkstra import dijkstra
+from path_reconstruction import path_to
+
+
+class LandmarkTable:
+
+	def __init__(self, landmarks, dist_from, dist_to):
+		"""Initialize a table of shortest-path distances to and from a few landmark vertices.
+
+		Arguments:
+		landmarks -- list of the landmark vertices
+		dist_from -- dist_from[v][i] is the shortest-path distance from landmarks[i] to v
+		dist_to -- dist_to[v][i] is the shortest-path distance from v to landmarks[i]
+		"""
+		self.landmarks = landmarks
+		self.dist_from = dist_from
+		self.dist_to = dist_to
+
+	@classmethod
+	def build(cls, G, k, landmarks=None, G_T=None):
+		"""Choose k landmarks of graph G and compute their distance tables with dijkstra.
+
+		Arguments:
+		G -- a directed, weighted graph with nonnegative weights
+		k -- number of landmarks, ignored if landmarks is given
+		landmarks -- optional list of landmark vertices to use instead of choosing them
+		G_T -- optional precomputed transpose of G
+		"""
+		if G_T is None:
+			G_T = G.transpose() if G.is_directed() else G
+		if landmarks is None:
+			landmarks = select_landmarks(G, k)
+
+		card_V = G.get_card_V()
+		dist_from = [[] for v in range(card_V)]
+		dist_to = [[] for v in range(card_V)]
+		for landmark in landmarks:
+			d_from, _ = dijkstra(G, landmark, engine="lazy")
+			d_to, _ = dijkstra(G_T, landmark, engine="lazy")
+			for v in range(card_V):
+				dist_from[v].append(d_from[v])
+				dist_to[v].append(d_to[v])
+		return cls(list(landmarks), dist_from, dist_to)
+
+	def save(self, file):
+		"""Serialize this table to a NumPy .npz file."""
+		np.savez(file, landmarks=np.array(self.landmarks, dtype=np.int64),
+				 dist_from=np.array(self.dist_from, dtype=float).reshape(-1, len(self.landmarks)),
+				 dist_to=np.array(self.dist_to, dtype=float).reshape(-1, len(self.landmarks)))
+
+	@classmethod
+	def load(cls, file):
+		"""Return the table serialized in a NumPy .npz file by save."""
+		with np.load(file) as data:
+			return cls(data["landmarks"].tolist(), data["dist_from"].tolist(), data["dist_to"].tolist())
+
+	def lower_bound(self, v, t):
+		"""Return a lower bound on the shortest-path distance from v to t, using the
+		triangle inequality through each landmark L:
+		dist(v, t) >= dist(L, t) - dist(L, v) and dist(v, t) >= dist(v, L) - dist(t, L).
+		Infinity means that t is not reachable from v."""
+		inf = float('inf')
+		bound = 0
+		for from_v, from_t, to_v, to_t in zip(self.dist_from[v], self.dist_from[t],
+												 self.dist_to[v], self.dist_to[t]):
+			# Skip a bound only when its subtracted distance is infinite.
+			if from_v < inf and from_t - from_v > bound:
+				bound = from_t - from_v
+			if to_t < inf and to_v - to_t > bound:
+				bound = to_v - to_t
+		return bound
+
+
+def select_landmarks(G, k):
+	"""Choose k landmarks of graph G by farthest-point selection: each new landmark is a
+	vertex whose distance from the landmarks chosen so far is largest, preferring
+	vertices that they cannot reach at all.
+
+	Arguments:
+	G -- a directed, weighted graph with nonnegative weights
+	k -- number of landmarks to choose
+	Returns:
+	A list of k distinct vertices
+	"""
+	card_V = G.get_card_V()
+	k = min(k, card_V)
+	# Start from the vertex with the most outgoing edges.
+	landmarks = [max(range(card_V), key=lambda v: sum(1 for edge in G.get_neighbors(v)))]
+	nearest, _ = dijkstra(G, landmarks[0], engine="lazy")
+	while len(landmarks) < k:
+		candidates = [v for v in range(card_V) if v not in landmarks]
+		landmark = max(candidates, key=lambda v: nearest[v])
+		landmarks.append(landmark)
+		d, _ = dijkstra(G, landmark, engine="lazy")
+		nearest = [min(nearest[v], d[v]) for v in range(card_V)]
+	return landmarks
+
+
+def alt_search(G, s, t, table):
+	"""Find a shortest path from s to t with A* search, guided by the landmark lower
+	bounds of table.  The bounds are consistent, so each vertex is settled at most
+	once and the search stops as soon as t is settled.
+
+	Arguments:
+	G -- a directed, weighted graph with nonnegative weights
+	s -- index of source vertex
+	t -- index of target vertex
+	table -- a LandmarkTable built for G
+
+	Returns:
+	distance -- shortest-path distance from s to t, infinity if t is unreachable
+	path -- list of vertices on a shortest path from s to t, empty if t is unreachable
+	settled -- number of vertices settled before stopping
+	"""
+	inf = float('inf')
+	card_V = G.get_card_V()
+	d = [inf] * card_V
+	pi = [None] * card_V
+	d[s] = 0
+	settled = 0
+
+	frontier = [(table.lower_bound(s, t), s)]
+	done = [False] * card_V
+	while frontier:
+		f_u, u = heapq.heappop(frontier)
+		if done[u]:
+			continue  # stale entry
+		done[u] = True
+		settled += 1
+		if u == t:
+			break
+
+		for v, weight in G.get_neighbors(u):
+			d_v = d[u] + weight
+			if d_v < d[v]:
+				h_v = table.lower_bound(v, t)
+				if h_v == inf:
+					continue  # t is not reachable through v
+				d[v] = d_v
+				pi[v] = u
+				heapq.heappush(frontier, (d_v + h_v, v))
+
+	return d[t], path_to(pi, s, t), settled
+
+
+def alt_shortest_path(G, s, t, table):
+	"""Find a shortest path from s to t with landmark-guided A* search.
+
+	Arguments:
+	G -- a directed, weighted graph with nonnegative weights
+	s -- index of source vertex
+	t -- index of target vertex
+	table -- a LandmarkTable built for G
+
+	Returns:
+	distance -- shortest-path distance from s to t, infinity if t is unreachable
+	path -- list of vertices on a shortest path from s to t, empty if t is unreachable
+	"""
+	distance, path, settled = alt_search(G, s, t, table)
+	return distance, path
+
+
+# Testing
+if __name__ == "__main__":
+
+	import io
+	from adjacency_list_graph import AdjacencyListGraph
+	from underground_data import load_network, insert_network_edges
+	from dijkstra import dijkstra_to_target
+	from generate_random_graph import generate_random_graph
+
+	# Distances must agree with dijkstra, also after a round trip through a file.
+	card_V = 100
+	graph1 = generate_random_graph(card_V, 0.05, True, True, True, 0, 15)
+	table1 = LandmarkTable.build(graph1, 4)
+	file = io.BytesIO()
+	table1.save(file)
+	file.seek(0)
+	table1 = LandmarkTable.load(file)
+	all_equal = True
+	for s in range(card_V):
+		d, pi = dijkstra(graph1, s)
+		for t in range(card_V):
+			distance, path = alt_shortest_path(graph1, s, t, table1)
+			if distance != d[t] or (path and sum(graph1.find_edge(u, v).get_weight()
+					for u, v in zip(path, path[1:])) != distance):
+				print("A* mismatch for vertices", s, t)
+				all_equal = False
+	print("All A* distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Count settled vertices over all station pairs of the Underground network.
+	stations, edges = load_network()
+	graph2 = AdjacencyListGraph(len(stations), directed=True, weighted=True)
+	insert_network_edges(graph2, edges)
+
+	card_V = len(stations)
+	for k in (4, 8, 16):
+		table2 = LandmarkTable.build(graph2, k)
+		pairs = 0
+		dijkstra_settled = 0
+		alt_settled = 0
+		all_equal = True
+		for s in range(card_V):
+			for t in range(card_V):
+				if s != t:
+					pairs += 1
+					d, pi, settled = dijkstra_to_target(graph2, s, t)
+					dijkstra_settled += settled
+					distance, path, settled = alt_search(graph2, s, t, table2)
+					alt_settled += settled
+					all_equal = all_equal and distance == d[t]
+		print("%d landmarks: distances %sequal, mean vertices settled %.1f (early-exit dijkstra %.1f)"
+			  % (k, "" if all_equal else "not ", alt_settled / pairs, dijkstra_settled / pairs))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# apsp_cache.py
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from all_pairs_shortest_paths import create_weight_matrix, floyd_warshall
+from path_reconstruction import hop_counts
+
+DEFAULT_CACHE_DIR = ".apsp_cache"
+MATRIX_NAMES = ("distances", "hops", "predecessors")
+# Change whenever compute_apsp or the stored matrices change, so that entries
+# written by an older version are recomputed instead of loaded.
+APSP_VERSION = "floyd_warshall 1"
+
+
+def graph_hash(G):
+	"""Return a hex digest identifying the vertices, edges, and weights of graph G,
+	independent of the order in which edges were inserted, and APSP_VERSION."""
+	digest = hashlib.sha256()
+	digest.update(("%s\n%d %s\n" % (APSP_VERSION, G.get_card_V(), G.is_directed())).encode())
+	for u in range(G.get_card_V()):
+		for v, weight in sorted(G.get_neighbors(u)):
+			digest.update(("%d %d %r\n" % (u, v, float(weight))).encode())
+	return digest.hexdigest()
+
+
+def hop_matrix(Pi):
+	"""Return the number of edges on each path of predecessor matrix Pi: 0 on the
+	diagonal and -1 where there is no path.  All paths are followed back one edge
+	at a time together, so the work is vectorised over every pair."""
+	return hop_counts(Pi, np.arange(Pi.shape[0]))
+
+
+def compute_apsp(G):
+	"""Return the distance, hop-count, and predecessor matrices of graph G."""
+	D, Pi = floyd_warshall(create_weight_matrix(G))
+	return D, hop_matrix(Pi), Pi
+
+
+def load_or_compute_apsp(G, cache_dir=DEFAULT_CACHE_DIR):
+	"""Return the all-pairs distance, hop-count, and predecessor matrices of graph G,
+	reading them from cache_dir if they were stored there for a graph with the same
+	edges, and computing and storing them otherwise.  Cached matrices are opened as
+	read-only memory maps, so loading does not read them into memory up front.
+
+	Arguments:
+	G -- a directed, weighted graph with nonnegative weights
+	cache_dir -- directory holding one subdirectory of .npy files per graph hash
+	Returns:
+	D -- D[i, j] is the shortest-path distance from i to j, infinity if unreachable
+	hops -- hops[i, j] is the number of edges on that shortest path, -1 if unreachable
+	Pi -- Pi[i, j] is the predecessor of j on that path, -1 if none
+	"""
+	if not G.is_weighted():
+		raise RuntimeError("All-pairs matrices are only cached for weighted graphs.")
+	entry = os.path.join(cache_dir, graph_hash(G))
+	try:
+		return tuple(np.load(os.path.join(entry, name + ".npy"), mmap_mode="r") for name in MATRIX_NAMES)
+	except FileNotFoundError:
+		pass
+
+	matrices = compute_apsp(G)
+
+	# Write into a temporary directory and rename it, so that an interrupted run
+	# never leaves a partial entry behind.
+	os.makedirs(cache_dir, exist_ok=True)
+	staging = tempfile.mkdtemp(dir=cache_dir)
+	try:
+		for name, matrix in zip(MATRIX_NAMES, matrices):
+			np.save(os.path.join(staging, name + ".npy"), matrix)
+		os.rename(staging, entry)
+	except OSError:
+		# Another run stored the same entry first.
+		shutil.rmtree(staging, ignore_errors=True)
+	return matrices
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from dijkstra import dijkstra
+	from generate_random_graph import generate_random_graph
+
+	card_V = 200
+	graph = generate_random_graph(card_V, 0.03, True, True, True, 1, 15)
+	cache_dir = tempfile.mkdtemp()
+
+	start = time.perf_counter()
+	D, hops, Pi = load_or_compute_apsp(graph, cache_dir)
+	print("Computed in %.3f s" % (time.perf_counter() - start))
+	start = time.perf_counter()
+	D2, hops2, Pi2 = load_or_compute_apsp(graph, cache_dir)
+	print("Loaded in %.3f s" % (time.perf_counter() - start))
+	print(np.array_equal(D, D2), np.array_equal(hops, hops2), np.array_equal(Pi, Pi2))
+
+	# Distances agree with dijkstra, and hop counts with the lengths of the paths in Pi.
+	all_equal = True
+	for s in range(card_V):
+		d, pi = dijkstra(graph, s)
+		if not np.array_equal(D2[s], np.array(d, dtype=float)):
+			all_equal = False
+		for t in range(card_V):
+			count = 0
+			v = t
+			while Pi2[s, v] != -1:
+				v = Pi2[s, v]
+				count += 1
+			if hops2[s, t] != (count if v == s else -1):
+				all_equal = False
+	print("Cached matrices " + ("agree" if all_equal else "do not agree") + " with dijkstra")
+
+	# Changing the graph changes the hash, so the matrices are recomputed.
+	u, v = graph.get_edge_list()[0]
+	graph.delete_edge(u, v)
+	D3, hops3, Pi3 = load_or_compute_apsp(graph, cache_dir)
+	print(len(os.listdir(cache_dir)), "cache entries")
+
+	# Unweighted graphs are rejected before anything is computed or stored.
+	try:
+		load_or_compute_apsp(generate_random_graph(card_V, 0.03, True, True, False), cache_dir)
+		print("Unweighted graph accepted")
+	except RuntimeError as error:
+		print(error)
+	shutil.rmtree(cache_dir)
@@ -30,6 +30,10 @@
 #                                                                       #
 #########################################################################
 
+from collections import deque
+
+import numpy as np
+
 from single_source_shortest_paths import initialize_single_source, relax
 
 
@@ -51,20 +55,144 @@ def bellman_ford(G, s):
 
 	# Run through all the edges |V| - 1 times.
 	for i in range(1, card_V):
+		changed = False
 		for u in range(card_V):
-			for edge in G.get_adj_list(u):
+			for v, weight in G.get_neighbors(u):
 				# Relax each edge.
-				relax(u, edge.get_v(), edge.get_weight(), d, pi)
+				if d[u] + weight < d[v]:
+					relax(u, v, weight, d, pi)
+					changed = True
+		# A pass without changes leaves d final, and no negative-weight cycle is reachable.
+		if not changed:
+			return d, pi, True
 
 	# One more pass to see whether a relaxation would have changed a distance.
 	for u in range(card_V):
-		for edge in G.get_adj_list(u):
+		for v, weight in G.get_neighbors(u):
 			# If changed, a negative cycle exists.
-			if d[edge.get_v()] > d[u] + edge.get_weight():
+			if d[v] > d[u] + weight:
 				return d, pi, False  # negative-weight cycle
 	return d, pi, True
 
 
+def bellman_ford_queue(G, s):
+	"""Solve the single-source shortest-paths problem in the general case in which
+	edge weights may be negative, relaxing only the edges leaving vertices whose
+	distance changed.  Such vertices wait in a first-in, first-out queue, which
+	processes them in the same rounds as the passes of bellman_ford.  Without a
+	negative-weight cycle there are at most |V| - 1 rounds, so a vertex entering
+	the queue for the |V|th time shows that a negative-weight cycle is reachable.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of the source vertex
+	Returns:
+	d -- distances from source s
+	pi -- predecessors
+	A boolean value indicating whether there is a negative-weight cycle
+	reachable from the source; True if no negative-weight cycle, False if there is one
+	"""
+	card_V = G.get_card_V()
+	d, pi = initialize_single_source(G, s)
+
+	queue = deque([s])
+	in_queue = [False] * card_V
+	in_queue[s] = True
+	count = [0] * card_V  # number of times each vertex has entered the queue
+	count[s] = 1
+
+	while queue:
+		u = queue.popleft()
+		in_queue[u] = False
+		d_u = d[u]
+		for v, weight in G.get_neighbors(u):
+			if d_u + weight < d[v]:
+				d[v] = d_u + weight
+				pi[v] = u
+				if not in_queue[v]:
+					count[v] += 1
+					if count[v] >= card_V:
+						return d, pi, False  # negative-weight cycle
+					queue.append(v)
+					in_queue[v] = True
+	return d, pi, True
+
+
+def edge_arrays(G):
+	"""Return the edges of G as NumPy arrays (sources, targets, weights), listing an
+	undirected edge once in each direction."""
+	sources = []
+	targets = []
+	weights = []
+	for u in range(G.get_card_V()):
+		for v, weight in G.get_neighbors(u):
+			sources.append(u)
+			targets.append(v)
+			weights.append(weight)
+	return (np.array(sources, dtype=np.int64), np.array(targets, dtype=np.int64),
+			np.array(weights, dtype=float))
+
+
+def bellman_ford_edges(card_V, edges, s):
+	"""Solve the single-source shortest-paths problem, with edge weights that may be
+	negative, from one or many sources at once.  Each pass relaxes every edge from
+	every source together: the distances of the edge sources are gathered, the
+	weights added, and the minimum scattered onto the edge targets with
+	np.minimum.at.  Passes stop as soon as one changes no distance.
+
+	Arguments:
+	card_V -- number of vertices
+	edges -- tuple (sources, targets, weights) of NumPy arrays with one entry per edge
+	s -- index of the source vertex, or a sequence of source vertices
+	Returns:
+	d -- distances from each source: an array of shape (|V|,) for one source, or
+	(len(s), |V|) with one row per source
+	pi -- predecessors, of the same shape as d, with -1 where there is none
+	A boolean value for each source indicating whether there is a negative-weight
+	cycle reachable from it; True if no negative-weight cycle, False if there is one
+	"""
+	single = np.ndim(s) == 0
+	sources = np.atleast_1d(np.asarray(s, dtype=np.int64))
+	edge_sources, edge_targets, weights = (np.asarray(column) for column in edges)
+	weights = weights.astype(float)[:, np.newaxis]
+	columns = np.arange(len(sources))
+
+	# Vertices run down the rows and sources across the columns, so that the
+	# gathers and scatters index the first axis.
+	d = np.full((card_V, len(sources)), float('inf'))
+	d[sources, columns] = 0
+	pi = np.full((card_V, len(sources)), -1, dtype=np.int64)
+
+	for i in range(card_V):
+		candidate = d[edge_sources] + weights
+		improving = candidate < d[edge_targets]
+		if not improving.any():
+			break
+		if i == card_V - 1:
+			break  # still improving after |V| - 1 passes
+		np.minimum.at(d, edge_targets, candidate)
+		# Each improved vertex takes as predecessor an edge source achieving its new distance.
+		edge_index, column = np.nonzero(improving & (candidate == d[edge_targets]))
+		pi[edge_targets[edge_index], column] = edge_sources[edge_index]
+
+	no_negative_cycle = ~improving.any(axis=0)
+	if single:
+		return d[:, 0], pi[:, 0], bool(no_negative_cycle[0])
+	return d.T, pi.T, no_negative_cycle
+
+
+def bellman_ford_arrays(G, s):
+	"""Run bellman_ford_edges on the edges of graph G, from one or many sources.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of the source vertex, or a sequence of source vertices
+	Returns:
+	The same d, pi, and negative-weight cycle indication as bellman_ford_edges
+	"""
+	return bellman_ford_edges(G.get_card_V(), edge_arrays(G), s)
+
+
 # Testing
 if __name__ == "__main__":
 
@@ -93,3 +221,64 @@ if __name__ == "__main__":
 	print("No negative-weight cycle:", cycle)
 	for i in range(len(vertices)):
 		print(vertices[i] + ": d = " + str(d[i]) + ", pi = " + ("None" if pi[i] is None else vertices[pi[i]]))
+	print()
+
+	# The queue-based variant agrees with bellman_ford, including on negative-weight cycles.
+	from generate_random_graph import generate_random_graph
+	card_V = 100
+	all_equal = True
+	for graph in (graph1, graph2, generate_random_graph(card_V, 0.05, True, True, True, 0, 15)):
+		for s in range(graph.get_card_V()):
+			d, pi, cycle = bellman_ford(graph, s)
+			queue_d, queue_pi, queue_cycle = bellman_ford_queue(graph, s)
+			if cycle != queue_cycle or (cycle and d != queue_d):
+				print("Queue-based mismatch for source vertex", s)
+				all_equal = False
+	print("All queue-based results are " + ("not " if not all_equal else "") + "equal")
+	print()
+
+	# The vectorised variant agrees with bellman_ford from every source at once.
+	for graph in (graph1, graph2):
+		d, pi, cycle = bellman_ford_arrays(graph, vertices.index('s'))
+		print("Vectorised, no negative-weight cycle:", cycle, d.tolist())
+	all_equal = True
+	for trial in range(10):
+		graph3 = generate_random_graph(card_V, 0.05, True, True, True, -2, 15)
+		D, Pi, cycles = bellman_ford_arrays(graph3, range(card_V))
+		for s in range(card_V):
+			d, pi, cycle = bellman_ford(graph3, s)
+			if cycle != cycles[s] or (cycle and D[s].tolist() != [float(x) for x in d]):
+				all_equal = False
+			if cycle:
+				# Every predecessor edge must be tight and lead back to s.
+				for t in range(card_V):
+					v = t
+					for step in range(card_V):
+						if Pi[s, v] < 0:
+							break
+						if D[s, Pi[s, v]] + graph3.find_edge(Pi[s, v], v).get_weight() != D[s, v]:
+							all_equal = False
+						v = Pi[s, v]
+					if D[s, t] < float('inf') and v != s:
+						all_equal = False
+	print("All vectorised results are " + ("not " if not all_equal else "") + "equal")
+
+	# All sources of the Underground network with some negative weights.
+	import time
+	from underground_data import load_network, insert_network_edges
+	stations, edges = load_network()
+	graph4 = AdjacencyListGraph(len(stations), directed=True, weighted=True)
+	insert_network_edges(graph4, edges)
+	for edge in graph4.get_adj_list(0):
+		edge.set_weight(-1)  # a discount on the connections leaving one station
+	start = time.perf_counter()
+	D, Pi, cycles = bellman_ford_arrays(graph4, range(len(stations)))
+	vectorised_time = time.perf_counter() - start
+	start = time.perf_counter()
+	rows = [bellman_ford_queue(graph4, s) for s in range(len(stations))]
+	queue_time = time.perf_counter() - start
+	start = time.perf_counter()
+	rows = [bellman_ford(graph4, s) for s in range(len(stations))]
+	print("All %d sources: vectorised %.3f s, queue-based %.3f s, classic %.3f s, results %s"
+		  % (len(stations), vectorised_time, queue_time, time.perf_counter() - start,
+			 "equal" if all(D[s].tolist() == [float(x) for x in rows[s][0]] for s in range(len(stations))) else "not equal"))
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# bidirectional_dijkstra.py
+
+import heapq
+
+
+def bidirectional_search(G, G_T, s, t):
+	"""Find a shortest path from s to t by running Dijkstra's algorithm forward from s
+	in G and backward from t in the transpose G_T, expanding whichever frontier has
+	the smaller minimum key.  The search stops once the two smallest keys add up to
+	at least the best s-t distance seen so far, which is then optimal.
+
+	Arguments:
+	G -- a directed, weighted graph
+	G_T -- the transpose of G (G itself if G is undirected)
+	s -- index of source vertex
+	t -- index of target vertex
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	distance -- shortest-path distance from s to t, infinity if t is unreachable
+	path -- list of vertices on a shortest path from s to t, empty if t is unreachable
+	settled -- number of vertices settled by the two searches together
+	"""
+	if s == t:
+		return 0, [s], 1
+
+	card_V = G.get_card_V()
+	inf = float('inf')
+	# Index 0 is the forward search from s in G, index 1 the backward search from t in G_T.
+	graphs = (G, G_T)
+	d = ([inf] * card_V, [inf] * card_V)
+	pi = ([None] * card_V, [None] * card_V)
+	frontiers = ([(0, s)], [(0, t)])
+	d[0][s] = 0
+	d[1][t] = 0
+
+	mu = inf  # length of the best s-t path found so far
+	meet = None  # vertex at which that path crosses from one search to the other
+	settled = 0
+
+	while frontiers[0] and frontiers[1]:
+		if frontiers[0][0][0] + frontiers[1][0][0] >= mu:
+			break  # no undiscovered path can be shorter than mu
+
+		side = 0 if frontiers[0][0][0] <= frontiers[1][0][0] else 1
+		d_side, d_other, pi_side = d[side], d[1 - side], pi[side]
+		d_u, u = heapq.heappop(frontiers[side])
+		if d_u > d_side[u]:
+			continue  # stale entry
+		settled += 1
+
+		for v, weight in graphs[side].get_neighbors(u):
+			d_v = d_u + weight
+			if d_v < d_side[v]:
+				d_side[v] = d_v
+				pi_side[v] = u
+				heapq.heappush(frontiers[side], (d_v, v))
+				# A path through v is known as soon as both searches have reached v.
+				if d_v + d_other[v] < mu:
+					mu = d_v + d_other[v]
+					meet = v
+
+	if meet is None:
+		return inf, [], settled
+
+	# Follow forward predecessors back to s, then backward predecessors on to t.
+	path = [meet]
+	while path[-1] != s:
+		path.append(pi[0][path[-1]])
+	path.reverse()
+	while path[-1] != t:
+		path.append(pi[1][path[-1]])
+	return mu, path, settled
+
+
+def bidirectional_dijkstra(G, s, t, G_T=None):
+	"""Find a shortest path from s to t with bidirectional Dijkstra search.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	t -- index of target vertex
+	G_T -- optional precomputed transpose of G, to reuse across many queries
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	distance -- shortest-path distance from s to t, infinity if t is unreachable
+	path -- list of vertices on a shortest path from s to t, empty if t is unreachable
+	"""
+	if G_T is None:
+		G_T = G.transpose() if G.is_directed() else G
+	distance, path, settled = bidirectional_search(G, G_T, s, t)
+	return distance, path
+
+
+# Testing
+if __name__ == "__main__":
+
+	from adjacency_list_graph import AdjacencyListGraph
+	from underground_data import load_network, insert_network_edges
+	from dijkstra import dijkstra, dijkstra_to_target
+	from generate_random_graph import generate_random_graph
+
+	# Distances must agree with dijkstra on random directed and undirected graphs.
+	card_V = 100
+	for directed in (True, False):
+		graph1 = generate_random_graph(card_V, 0.05, True, directed, True, 0, 15)
+		graph1_T = graph1.transpose() if directed else graph1
+		all_equal = True
+		for s in range(card_V):
+			d, pi = dijkstra(graph1, s)
+			for t in range(card_V):
+				distance, path, settled = bidirectional_search(graph1, graph1_T, s, t)
+				if distance != d[t] or (path and sum(graph1.find_edge(u, v).get_weight()
+						for u, v in zip(path, path[1:])) != distance):
+					print("Bidirectional mismatch for vertices", s, t)
+					all_equal = False
+		print("All bidirectional distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Count settled vertices over all station pairs of the Underground network.
+	stations, edges = load_network()
+	graph2 = AdjacencyListGraph(len(stations), directed=True, weighted=True)
+	insert_network_edges(graph2, edges)
+	graph2_T = graph2.transpose()
+
+	card_V = len(stations)
+	pairs = 0
+	unidirectional_settled = 0
+	bidirectional_settled = 0
+	all_equal = True
+	for s in range(card_V):
+		d, pi = dijkstra(graph2, s)
+		for t in range(card_V):
+			if s != t:
+				pairs += 1
+				unidirectional_settled += dijkstra_to_target(graph2, s, t)[2]
+				distance, path, settled = bidirectional_search(graph2, graph2_T, s, t)
+				bidirectional_settled += settled
+				all_equal = all_equal and distance == d[t]
+	print("All Underground distances are " + ("not " if not all_equal else "") + "equal")
+	print("Mean vertices settled per query over", pairs, "station pairs:")
+	print("  full dijkstra:         %.1f" % card_V)
+	print("  early-exit dijkstra:   %.1f" % (unidirectional_settled / pairs))
+	print("  bidirectional search:  %.1f" % (bidirectional_settled / pairs))
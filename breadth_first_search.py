@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# breadth_first_search.py
+
+import numpy as np
+
+from path_reconstruction import path_to
+
+
+def breadth_first_search(G, s):
+	"""Find the fewest edges on a path from s to every vertex, ignoring weights.
+
+	Arguments:
+	G -- a directed graph
+	s -- index of source vertex
+
+	Returns:
+	d -- number of edges on a path from s with the fewest edges, infinity if unreachable
+	pi -- predecessors
+	"""
+	card_V = G.get_card_V()
+	d = [float('inf')] * card_V
+	pi = [None] * card_V
+	d[s] = 0
+
+	frontier = [s]  # vertices whose distance is the current number of edges
+	hops = 0
+	while frontier:
+		hops += 1
+		next_frontier = []
+		for u in frontier:
+			for v, weight in G.get_neighbors(u):
+				if d[v] > hops:
+					d[v] = hops
+					pi[v] = u
+					next_frontier.append(v)
+		frontier = next_frontier
+
+	return d, pi
+
+
+def fewest_stops(G, s):
+	"""Find paths from s with the fewest edges and, among those, the smallest total
+	weight.  The search runs breadth first, one level of edges at a time.  The
+	weights of all vertices on one level are final before the level is expanded,
+	so an edge into the next level updates its target whenever it gives a smaller
+	weight.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	hops -- number of edges on a path from s with the fewest edges, infinity if unreachable
+	d -- smallest weight of such a path
+	pi -- predecessors
+	"""
+	card_V = G.get_card_V()
+	inf = float('inf')
+	hops = [inf] * card_V
+	d = [inf] * card_V
+	pi = [None] * card_V
+	hops[s] = 0
+	d[s] = 0
+
+	frontier = [s]
+	level = 0
+	while frontier:
+		level += 1
+		next_frontier = []
+		for u in frontier:
+			d_u = d[u]
+			for v, weight in G.get_neighbors(u):
+				if hops[v] > level:
+					hops[v] = level
+					next_frontier.append(v)
+				elif hops[v] < level or d_u + weight >= d[v]:
+					continue
+				d[v] = d_u + weight
+				pi[v] = u
+		frontier = next_frontier
+
+	return hops, d, pi
+
+
+def fewest_stops_path(G, s, t):
+	"""Find a path from s to t with the fewest edges and, among those, the smallest weight.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	t -- index of target vertex
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	stops -- number of edges on the path, infinity if t is unreachable
+	distance -- weight of the path, infinity if t is unreachable
+	path -- list of vertices on the path, empty if t is unreachable
+	"""
+	hops, d, pi = fewest_stops(G, s)
+	return hops[t], d[t], path_to(pi, s, t)
+
+
+def all_pairs_hops(G):
+	"""Return the matrix of the fewest edges on a path between each pair of vertices,
+	running breadth-first search from every vertex.
+
+	Arguments:
+	G -- a directed graph
+	Returns:
+	hops -- array of shape (|V|, |V|), where hops[i, j] is the number of edges on a
+	path from i to j with the fewest edges: 0 on the diagonal and -1 if j is unreachable
+	"""
+	card_V = G.get_card_V()
+	hops = np.full((card_V, card_V), -1, dtype=np.int64)
+	for s in range(card_V):
+		d, pi = breadth_first_search(G, s)
+		hops[s] = [-1 if hops_v == float('inf') else hops_v for hops_v in d]
+	return hops
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from adjacency_list_graph import AdjacencyListGraph
+	from underground_data import load_network, insert_network_edges
+	from generate_random_graph import generate_random_graph
+
+	def all_paths(G, s, t, visited):
+		"""Yield (edges, weight) for every simple path from s to t."""
+		if s == t:
+			yield 0, 0
+			return
+		for v, weight in G.get_neighbors(s):
+			if v not in visited:
+				for hops, d in all_paths(G, v, t, visited | {v}):
+					yield hops + 1, d + weight
+
+	# Compare with an exhaustive search over all simple paths of small graphs.
+	card_V = 9
+	all_equal = True
+	for trial in range(20):
+		graph1 = generate_random_graph(card_V, 0.3, True, True, True, 0, 15)
+		hops_matrix = all_pairs_hops(graph1)
+		for s in range(card_V):
+			hops, d, pi = fewest_stops(graph1, s)
+			for t in range(card_V):
+				best = min(all_paths(graph1, s, t, {s}), default=(float('inf'), float('inf')))
+				stops, distance, path = fewest_stops_path(graph1, s, t)
+				if (hops[t], d[t]) != best or (stops, distance) != best \
+						or hops_matrix[s, t] != (-1 if best[0] == float('inf') else best[0]) \
+						or (path and sum(graph1.find_edge(u, v).get_weight()
+										 for u, v in zip(path, path[1:])) != distance):
+					print("Fewest-stops mismatch for vertices", s, t)
+					all_equal = False
+	print("All fewest-stops results are " + ("not " if not all_equal else "") + "equal")
+
+	# Time the all-pairs stop counts of the Underground network.
+	stations, edges = load_network()
+	graph2 = AdjacencyListGraph(len(stations), directed=True, weighted=True)
+	insert_network_edges(graph2, edges)
+	start = time.perf_counter()
+	hops = all_pairs_hops(graph2)
+	print("All-pairs stop counts: %.3f s, most stops %d" % (time.perf_counter() - start, hops.max()))
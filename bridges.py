@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# bridges.py
+
+
+def bridges_and_articulation_points(G):
+	"""Find the bridges and articulation points of an undirected graph with Tarjan's
+	algorithm, in one depth-first search taking O(V + E) time.  The search keeps
+	an explicit stack of neighbor iterators instead of recursing, so long paths
+	cannot exceed the recursion limit.
+
+	A bridge is an edge whose removal disconnects its endpoints, and an
+	articulation point is a vertex whose removal disconnects some of the others.
+
+	Arguments:
+	G -- an undirected graph without multiple edges
+
+	Returns:
+	bridges -- list of bridges (u, v) with u < v
+	articulation_points -- sorted list of articulation points
+	"""
+	if G.is_directed():
+		raise RuntimeError("Bridges are only defined for undirected graphs.")
+
+	card_V = G.get_card_V()
+	discovery = [-1] * card_V  # discovery time, -1 if not yet discovered
+	low = [0] * card_V  # earliest discovery time reachable through the subtree and one back edge
+	parent = [None] * card_V
+	bridges = []
+	articulation_points = set()
+	time = 0
+
+	for root in range(card_V):
+		if discovery[root] >= 0:
+			continue
+		discovery[root] = low[root] = time
+		time += 1
+		root_children = 0
+		stack = [(root, iter(G.get_neighbors(root)))]
+
+		while stack:
+			u, neighbors = stack[-1]
+			for v, weight in neighbors:
+				if discovery[v] < 0:
+					# Tree edge: descend into v, and resume u's neighbors later.
+					parent[v] = u
+					discovery[v] = low[v] = time
+					time += 1
+					stack.append((v, iter(G.get_neighbors(v))))
+					break
+				elif v != parent[u] and discovery[v] < low[u]:
+					low[u] = discovery[v]  # back edge
+			else:
+				# All of u's neighbors are done, so return to its parent p.
+				stack.pop()
+				if stack:
+					p = stack[-1][0]
+					if low[u] < low[p]:
+						low[p] = low[u]
+					if low[u] > discovery[p]:
+						bridges.append((min(p, u), max(p, u)))
+					if p == root:
+						root_children += 1
+					elif low[u] >= discovery[p]:
+						articulation_points.add(p)
+
+		# The root separates its subtrees only if it has more than one.
+		if root_children > 1:
+			articulation_points.add(root)
+
+	return bridges, sorted(articulation_points)
+
+
+def find_bridges(G):
+	"""Return the list of bridges (u, v), with u < v, of undirected graph G."""
+	return bridges_and_articulation_points(G)[0]
+
+
+def find_articulation_points(G):
+	"""Return the sorted list of articulation points of undirected graph G."""
+	return bridges_and_articulation_points(G)[1]
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from adjacency_list_graph import AdjacencyListGraph
+	from underground_data import load_network, insert_network_edges
+	from generate_random_graph import generate_random_graph
+
+	def component_count(G, removed_vertex=None):
+		"""Count the connected components of G, ignoring removed_vertex."""
+		seen = [False] * G.get_card_V()
+		count = 0
+		for root in range(G.get_card_V()):
+			if seen[root] or root == removed_vertex:
+				continue
+			count += 1
+			seen[root] = True
+			stack = [root]
+			while stack:
+				for v, weight in G.get_neighbors(stack.pop()):
+					if not seen[v] and v != removed_vertex:
+						seen[v] = True
+						stack.append(v)
+		return count
+
+	# Compare with deleting each edge and each vertex in turn.
+	all_equal = True
+	for trial in range(20):
+		graph1 = generate_random_graph(40, 0.06, True, False, False)
+		bridges, articulation_points = bridges_and_articulation_points(graph1)
+		components = component_count(graph1)
+		expected_bridges = []
+		for u, v in graph1.get_edge_list():
+			graph_copy = graph1.copy()
+			graph_copy.delete_edge(u, v)
+			if component_count(graph_copy) > components:
+				expected_bridges.append((u, v))
+		expected_points = [x for x in range(40) if component_count(graph1, x) > components
+						   - (1 if sum(1 for edge in graph1.get_neighbors(x)) == 0 else 0)]
+		if sorted(bridges) != sorted(expected_bridges) or articulation_points != expected_points:
+			print("Mismatch in trial", trial)
+			all_equal = False
+	print("All bridges and articulation points are " + ("not " if not all_equal else "") + "equal")
+
+	# A path much longer than the recursion limit.
+	card_V = 20000
+	graph2 = AdjacencyListGraph(card_V, directed=False)
+	for u in range(card_V - 1):
+		graph2.insert_edge(u, u + 1)
+	bridges, articulation_points = bridges_and_articulation_points(graph2)
+	print(len(bridges) == card_V - 1, len(articulation_points) == card_V - 2)
+
+	# The Underground network.
+	stations, edges = load_network()
+	graph3 = AdjacencyListGraph(len(stations), directed=False, weighted=True)
+	insert_network_edges(graph3, edges)
+	start = time.perf_counter()
+	bridges, articulation_points = bridges_and_articulation_points(graph3)
+	print("%d of %d connections are bridges, %d stations are articulation points (%.4f s)"
+		  % (len(bridges), graph3.get_card_E(), len(articulation_points), time.perf_counter() - start))
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# contraction_hierarchy.py
+
+import heapq
+
+
+class ContractionHierarchy:
+
+	def __init__(self, G, max_settled=50):
+		"""Build a contraction hierarchy for graph G.  Vertices are contracted one by
+		one in order of increasing importance.  Contracting v removes it from the
+		remaining graph, adding a shortcut edge (u, x) through v whenever u -> v -> x
+		might be the only shortest path from u to x.  A query then only needs to
+		search upward in the order from both ends.
+
+		Arguments:
+		G -- a directed, weighted graph with nonnegative weights
+		max_settled -- number of vertices a witness search may settle before it gives
+		up and a shortcut is added anyway; smaller is faster to build but adds more shortcuts
+		"""
+		self.card_V = G.get_card_V()
+		self.max_settled = max_settled
+		self.shortcut_count = 0
+
+		# middle[(u, x)] is the contracted vertex that shortcut (u, x) bypasses,
+		# or None if (u, x) is an edge of G.
+		self.middle = {}
+		# up_out[v] holds the edges (v, x, weight) leaving v toward higher-ranked vertices,
+		# and down_in[v] the edges (u, v, weight) entering v from higher-ranked vertices.
+		self.up_out = [[] for v in range(self.card_V)]
+		self.down_in = [[] for v in range(self.card_V)]
+		self.rank = [None] * self.card_V
+
+		# Edges of the remaining graph, in both directions.
+		self.out_edges = [{} for v in range(self.card_V)]
+		self.in_edges = [{} for v in range(self.card_V)]
+		for u in range(self.card_V):
+			for x, weight in G.get_neighbors(u):
+				if u != x and weight < self.out_edges[u].get(x, float('inf')):
+					self.out_edges[u][x] = weight
+					self.in_edges[x][u] = weight
+					self.middle[(u, x)] = None
+
+		self.contract_all()
+
+		# The remaining-graph edges are only needed while building.
+		del self.out_edges
+		del self.in_edges
+
+	def get_card_V(self):
+		"""Return the number of vertices in the underlying graph."""
+		return self.card_V
+
+	def get_shortcut_count(self):
+		"""Return the number of shortcut edges added while building."""
+		return self.shortcut_count
+
+	def get_rank(self, v):
+		"""Return the position of vertex v in the contraction order."""
+		return self.rank[v]
+
+	def contract_all(self):
+		"""Contract every vertex, choosing the next one by lazily updated edge difference."""
+		deleted_neighbors = [0] * self.card_V
+		queue = [(self.priority(v, deleted_neighbors), v) for v in range(self.card_V)]
+		heapq.heapify(queue)
+		next_rank = 0
+		while queue:
+			priority, v = heapq.heappop(queue)
+			if self.rank[v] is not None:
+				continue
+			# The priority may be out of date.  Recompute it, and if v is no longer
+			# the most attractive vertex, put it back.
+			priority = self.priority(v, deleted_neighbors)
+			if queue and priority > queue[0][0]:
+				heapq.heappush(queue, (priority, v))
+				continue
+
+			neighbors = set(self.out_edges[v]) | set(self.in_edges[v])
+			self.contract(v)
+			self.rank[v] = next_rank
+			next_rank += 1
+			for u in neighbors:
+				deleted_neighbors[u] += 1
+
+	def priority(self, v, deleted_neighbors):
+		"""Return the edge difference of v plus its number of contracted neighbors."""
+		shortcuts = len(self.shortcuts_for(v))
+		return shortcuts - len(self.out_edges[v]) - len(self.in_edges[v]) + deleted_neighbors[v]
+
+	def shortcuts_for(self, v):
+		"""Return the list of shortcuts (u, x, weight) needed if v were contracted now."""
+		shortcuts = []
+		if not self.out_edges[v]:
+			return shortcuts
+		max_out = max(self.out_edges[v].values())
+		for u, weight_in in self.in_edges[v].items():
+			witness = self.witness_distances(u, v, weight_in + max_out)
+			for x, weight_out in self.out_edges[v].items():
+				if x != u and witness.get(x, float('inf')) > weight_in + weight_out:
+					shortcuts.append((u, x, weight_in + weight_out))
+		return shortcuts
+
+	def witness_distances(self, source, excluded, limit):
+		"""Run a bounded Dijkstra search from source in the remaining graph without
+		vertex excluded.  Return a dictionary of distances found, each of which is the
+		length of some path, although not necessarily a shortest one."""
+		dist = {source: 0}
+		frontier = [(0, source)]
+		settled = 0
+		while frontier:
+			d_u, u = heapq.heappop(frontier)
+			if d_u > dist[u]:
+				continue
+			if d_u > limit or settled >= self.max_settled:
+				break
+			settled += 1
+			for x, weight in self.out_edges[u].items():
+				if x != excluded:
+					d_x = d_u + weight
+					if d_x < dist.get(x, float('inf')):
+						dist[x] = d_x
+						heapq.heappush(frontier, (d_x, x))
+		return dist
+
+	def contract(self, v):
+		"""Remove v from the remaining graph, recording its edges in the hierarchy and
+		adding the shortcuts that its removal requires."""
+		shortcuts = self.shortcuts_for(v)
+
+		# Every remaining neighbor of v will be ranked above v.
+		for x, weight in self.out_edges[v].items():
+			self.up_out[v].append((x, weight))
+			del self.in_edges[x][v]
+		for u, weight in self.in_edges[v].items():
+			self.down_in[v].append((u, weight))
+			del self.out_edges[u][v]
+		self.out_edges[v] = {}
+		self.in_edges[v] = {}
+
+		for u, x, weight in shortcuts:
+			if weight < self.out_edges[u].get(x, float('inf')):
+				self.out_edges[u][x] = weight
+				self.in_edges[x][u] = weight
+				self.middle[(u, x)] = v
+				self.shortcut_count += 1
+
+	def search(self, s, t):
+		"""Run the upward searches from s and t, returning the shortest-path distance,
+		the vertex where the two searches meet, and both predecessor dictionaries."""
+		inf = float('inf')
+		dist = ({s: 0}, {t: 0})
+		pi = ({s: None}, {t: None})
+		frontiers = ([(0, s)], [(0, t)])
+		graphs = (self.up_out, self.down_in)
+		mu = 0 if s == t else inf
+		meet = s if s == t else None
+
+		while frontiers[0] or frontiers[1]:
+			# Expand the side with the smaller key; a side is finished once its keys reach mu.
+			side = 0 if not frontiers[1] or (frontiers[0] and frontiers[0][0][0] <= frontiers[1][0][0]) else 1
+			d_u, u = heapq.heappop(frontiers[side])
+			if d_u >= mu:
+				frontiers[side].clear()
+				continue
+			if d_u > dist[side][u]:
+				continue
+			for x, weight in graphs[side][u]:
+				d_x = d_u + weight
+				if d_x < dist[side].get(x, inf):
+					dist[side][x] = d_x
+					pi[side][x] = u
+					heapq.heappush(frontiers[side], (d_x, x))
+					if d_x + dist[1 - side].get(x, inf) < mu:
+						mu = d_x + dist[1 - side][x]
+						meet = x
+		return mu, meet, pi
+
+	def unpack(self, u, x, path):
+		"""Append to path the vertices of G after u along edge or shortcut (u, x)."""
+		v = self.middle[(u, x)]
+		if v is None:
+			path.append(x)
+		else:
+			self.unpack(u, v, path)
+			self.unpack(v, x, path)
+
+	def distance(self, s, t):
+		"""Return the shortest-path distance from s to t, infinity if t is unreachable."""
+		return self.search(s, t)[0]
+
+	def shortest_path(self, s, t):
+		"""Find a shortest path from s to t.
+
+		Arguments:
+		s -- index of source vertex
+		t -- index of target vertex
+
+		Returns:
+		distance -- shortest-path distance from s to t, infinity if t is unreachable
+		path -- list of vertices of G on a shortest path from s to t, empty if t is unreachable
+		"""
+		mu, meet, pi = self.search(s, t)
+		if meet is None:
+			return mu, []
+
+		# Hierarchy edges from s up to the meeting vertex, then down to t.
+		hierarchy_path = [meet]
+		while pi[0][hierarchy_path[-1]] is not None:
+			hierarchy_path.append(pi[0][hierarchy_path[-1]])
+		hierarchy_path.reverse()
+		while pi[1][hierarchy_path[-1]] is not None:
+			hierarchy_path.append(pi[1][hierarchy_path[-1]])
+
+		path = [s]
+		for u, x in zip(hierarchy_path, hierarchy_path[1:]):
+			self.unpack(u, x, path)
+		return mu, path
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from adjacency_list_graph import AdjacencyListGraph
+	from underground_data import load_network, insert_network_edges
+	from dijkstra import dijkstra
+	from generate_random_graph import generate_random_graph
+
+	def check_all_pairs(G, ch):
+		"""Assert that the hierarchy agrees with dijkstra on every pair of vertices."""
+		for s in range(G.get_card_V()):
+			d, pi = dijkstra(G, s)
+			for t in range(G.get_card_V()):
+				distance, path = ch.shortest_path(s, t)
+				assert distance == d[t], "distance mismatch for vertices " + str((s, t))
+				if path:
+					assert path[0] == s and path[-1] == t
+					assert sum(G.find_edge(u, v).get_weight() for u, v in zip(path, path[1:])) == distance, \
+						"path does not have the shortest-path length for vertices " + str((s, t))
+				else:
+					assert distance == float('inf')
+
+	# Random directed and undirected graphs.
+	for directed in (True, False):
+		graph1 = generate_random_graph(100, 0.05, True, directed, True, 0, 15)
+		check_all_pairs(graph1, ContractionHierarchy(graph1))
+	print("Random graphs agree with dijkstra")
+
+	# Every station pair of the Underground network.
+	stations, edges = load_network()
+	graph2 = AdjacencyListGraph(len(stations), directed=True, weighted=True)
+	insert_network_edges(graph2, edges)
+
+	start = time.perf_counter()
+	ch = ContractionHierarchy(graph2)
+	print("Preprocessing: %.3f s, %d shortcuts" % (time.perf_counter() - start, ch.get_shortcut_count()))
+	check_all_pairs(graph2, ch)
+	print("All Underground station pairs agree with dijkstra")
+
+	card_V = len(stations)
+	start = time.perf_counter()
+	for s in range(card_V):
+		for t in range(card_V):
+			ch.distance(s, t)
+	print("Mean query time: %.1f microseconds" % ((time.perf_counter() - start) / card_V ** 2 * 1e6))
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# csr_graph.py
+
+from array import array
+from numbers import Integral
+
+from adjacency_list_graph import Edge
+
+
+def weight_array(weight_list):
+	"""Return an array of the weights in weight_list, keeping integer weights as
+	integers so that distances stay integral."""
+	if all(isinstance(w, Integral) for w in weight_list):
+		return array("q", weight_list)
+	return array("d", weight_list)
+
+
+class CSRGraph:
+
+	def __init__(self, card_V, offsets, targets, weights=None, directed=True, card_E=None):
+		"""Initialize a read-only graph stored in compressed sparse row form.
+		The adjacency list of vertex u is held in targets[offsets[u]:offsets[u+1]],
+		with the matching edge weights in the same slice of weights.
+
+		Arguments:
+		card_V -- number of vertices in this graph
+		offsets -- array of card_V + 1 indices into targets
+		targets -- array holding the adjacency lists of all vertices, one after another
+		weights -- optional array of edge weights, parallel to targets
+		directed -- boolean indicating whether the graph is directed
+		card_E -- number of edges, defaults to len(targets) if directed, half of it if undirected
+		"""
+		if len(offsets) != card_V + 1:
+			raise RuntimeError("Offsets array must have " + str(card_V + 1) + " entries.")
+		if weights is not None and len(weights) != len(targets):
+			raise RuntimeError("Weights array must be the same length as targets array.")
+		self.card_V = card_V
+		self.offsets = offsets
+		self.targets = targets
+		self.weights = weights
+		self.directed = directed
+		self.weighted = weights is not None
+		if card_E is None:
+			card_E = len(targets) if directed else len(targets) // 2
+		self.card_E = card_E
+
+	@classmethod
+	def from_graph(cls, G):
+		"""Return a CSRGraph with the same vertices, edges, weights, and adjacency-list
+		order as graph G, which may be any graph supporting get_adj_list."""
+		card_V = G.get_card_V()
+		weighted = G.is_weighted()
+		offsets = array("q", [0])
+		targets = array("q")
+		weight_list = []
+		for u in range(card_V):
+			for edge in G.get_adj_list(u):
+				targets.append(edge.get_v())
+				if weighted:
+					weight_list.append(edge.get_weight())
+			offsets.append(len(targets))
+
+		weights = weight_array(weight_list) if weighted else None
+		return cls(card_V, offsets, targets, weights, G.is_directed(), G.get_card_E())
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.card_V
+
+	def get_card_E(self):
+		"""Return the number of edges in this graph."""
+		return self.card_E
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u, as Edge objects."""
+		lo, hi = self.offsets[u], self.offsets[u + 1]
+		if self.weighted:
+			return map(Edge, self.targets[lo:hi], self.weights[lo:hi])
+		return map(Edge, self.targets[lo:hi])
+
+	def get_neighbors(self, u):
+		"""Return an iterator of (v, weight) pairs for the edges leaving vertex u,
+		without creating Edge objects.  Weights are None in an unweighted graph."""
+		lo, hi = self.offsets[u], self.offsets[u + 1]
+		if self.weighted:
+			return zip(self.targets[lo:hi], self.weights[lo:hi])
+		return zip(self.targets[lo:hi], [None] * (hi - lo))
+
+	def get_degree(self, u):
+		"""Return the number of edges leaving vertex u."""
+		return self.offsets[u + 1] - self.offsets[u]
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.directed
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.weighted
+
+	def find_edge(self, u, v):
+		"""Return an Edge object for edge (u, v) if (u, v) is in this graph, None otherwise."""
+		for i in range(self.offsets[u], self.offsets[u + 1]):
+			if self.targets[i] == v:
+				return Edge(v, self.weights[i] if self.weighted else None)
+		return None
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is in this graph, False otherwise."""
+		return v in self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+	def get_edge_list(self):
+		"""Return a Python list containing the edges of this graph."""
+		edge_list = []
+		for u in range(self.card_V):
+			for i in range(self.offsets[u], self.offsets[u + 1]):
+				v = self.targets[i]
+				if self.directed or u < v:
+					edge_list.append((u, v))
+		return edge_list
+
+	def transpose(self):
+		"""Return the transpose of this graph, also in compressed sparse row form."""
+		# Count the edges entering each vertex, then place them with a prefix sum.
+		in_degree = [0] * (self.card_V + 1)
+		for v in self.targets:
+			in_degree[v + 1] += 1
+		offsets = array("q", in_degree)
+		for u in range(self.card_V):
+			offsets[u + 1] += offsets[u]
+		next_slot = offsets[:-1].tolist()
+		targets = array("q", bytes(8 * len(self.targets)))
+		weights = None
+		if self.weighted:
+			weights = array(self.weights.typecode, self.weights)
+		for u in range(self.card_V):
+			for i in range(self.offsets[u], self.offsets[u + 1]):
+				v = self.targets[i]
+				slot = next_slot[v]
+				targets[slot] = u
+				if self.weighted:
+					weights[slot] = self.weights[i]
+				next_slot[v] += 1
+		return CSRGraph(self.card_V, offsets, targets, weights, self.directed, self.card_E)
+
+	def thaw(self):
+		"""Return a mutable AdjacencyListGraph copy of this graph."""
+		from adjacency_list_graph import AdjacencyListGraph
+		graph = AdjacencyListGraph(self.card_V, self.directed, self.weighted)
+		for u in range(self.card_V):
+			for v, weight in self.get_neighbors(u):
+				# Each undirected edge appears in both lists, but is inserted once.
+				if self.directed or u < v:
+					graph.insert_edge(u, v, weight)
+		return graph
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string."""
+		return self.strmap()
+
+	def strmap(self, mapping_func=None):
+		"""Return the adjacency lists formatted as a string, but mapping vertex numbers
+		by a mapping function.  If mapping_func is None, then do not map."""
+		if mapping_func is None:
+			mapping_func = lambda i: i
+
+		result = ""
+		for i in range(self.card_V):
+			result += str(mapping_func(i)) + ": "
+			for edge in self.get_adj_list(i):
+				result += edge.strmap(mapping_func) + " "
+			result += "\n"
+		return result
+
+
+# Testing
+if __name__ == "__main__":
+
+	import sys
+	import time
+	from adjacency_list_graph import AdjacencyListGraph
+	from dijkstra import dijkstra
+	from generate_random_graph import generate_random_graph
+
+	# Textbook example.
+	vertices = ['s', 't', 'x', 'y', 'z']
+	edges = [('s', 't', 10), ('s', 'y', 5), ('t', 'x', 1), ('t', 'y', 2), ('x', 'z', 4),
+			('y', 't', 3), ('y', 'x', 9), ('y', 'z', 2), ('z', 's', 7), ('z', 'x', 6)]
+	graph1 = AdjacencyListGraph(len(vertices), True, True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	csr1 = graph1.freeze()
+	print(csr1.strmap(lambda i: vertices[i]))
+	print(csr1.transpose().strmap(lambda i: vertices[i]))
+	print(csr1.get_edge_list() == graph1.get_edge_list())
+
+	# Distances must agree with the linked-list graph.
+	card_V = 200
+	graph2 = generate_random_graph(card_V, 0.05, True, True, True, 0, 15)
+	csr2 = graph2.freeze()
+	all_equal = True
+	for s in range(card_V):
+		if dijkstra(graph2, s) != dijkstra(csr2, s):
+			print("Shortest-path distances mismatch for source vertex", s)
+			all_equal = False
+	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Walking every adjacency list should be faster than chasing linked-list pointers.
+	for name, graph in (("Adjacency lists", graph2), ("CSR", csr2)):
+		start = time.perf_counter()
+		for i in range(100):
+			for u in range(card_V):
+				for v, weight in graph.get_neighbors(u):
+					pass
+		print("%s: %.3f s" % (name, time.perf_counter() - start))
+	print("CSR arrays use", sys.getsizeof(csr2.offsets) + sys.getsizeof(csr2.targets) + sys.getsizeof(csr2.weights), "bytes")
+
+	# Undirected graphs round-trip through thaw.
+	graph3 = generate_random_graph(20, 0.2, True, False, True, 1, 9)
+	csr3 = graph3.freeze()
+	print(csr3.get_card_E() == graph3.get_card_E(), csr3.thaw().get_edge_list() == graph3.get_edge_list())
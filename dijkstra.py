@@ -30,16 +30,28 @@
 #                                                                       #
 #########################################################################
 
+import heapq
+from numbers import Integral
+
 from single_source_shortest_paths import initialize_single_source, relax
 from min_heap_priority_queue import MinHeapPriorityQueue
+from vertex_min_priority_queue import VertexMinPriorityQueue
+from bidirectional_dijkstra import bidirectional_dijkstra
+from path_reconstruction import path_to
 
 
-def dijkstra(G, s):
+def dijkstra(G, s, engine="heap", max_weight=None):
 	"""Solve single-source shortest-paths problem with no negative-weight edges.
 
 	Arguments:
 	G -- a directed, weighted graph
 	s -- index of source vertex
+	engine -- "heap" to seed a MinHeapPriorityQueue with every vertex, "vertex" to do
+	the same with the specialised VertexMinPriorityQueue (see dijkstra_vertex_queue),
+	"lazy" to enqueue vertices only as they are reached (see dijkstra_lazy), or
+	"dial" to use buckets indexed by distance when all weights are integers (see dijkstra_dial)
+	max_weight -- for the "dial" engine, optional result of integer_max_weight(G), to
+	skip checking the weights again when running from many sources
 	Assumption:
 	All weights are nonnegative
 
@@ -47,35 +59,240 @@ def dijkstra(G, s):
 	d -- distances from source vertex s
 	pi -- predecessors
 	"""
+	if engine == "lazy":
+		return dijkstra_lazy(G, s)
+	if engine == "vertex":
+		return dijkstra_vertex_queue(G, s)
+	if engine == "dial":
+		return dijkstra_dial(G, s, max_weight)
+	if engine != "heap":
+		raise RuntimeError("Unknown Dijkstra engine " + str(engine) + ".")
 
 	card_V = G.get_card_V()
 
 	d, pi = initialize_single_source(G, s)
 
 	# Key function for the priority queue is distance.
-	queue = MinHeapPriorityQueue(lambda u: d[u])
-	for u in range(card_V):
-		queue.insert(u)
+	queue = MinHeapPriorityQueue.from_iterable(range(card_V), lambda u: d[u])
 
 	while queue.get_size() > 0:  # while the priority queue is not empty
 		u = queue.extract_min()  # extract a vertex with the minimum distance
 
 		# Relax each edge and update d and pi.
-		for edge in G.get_adj_list(u):
-			v = edge.get_v()
+		for v, weight in G.get_neighbors(u):
 			# Upon each relaxation, decrease the key in the priority queue.
-			relax(u, v, edge.get_weight(), d, pi,
-					lambda v: queue.decrease_key(v, d[u] + edge.get_weight()))
+			relax(u, v, weight, d, pi,
+					lambda v: queue.decrease_key(v, d[u] + weight))
+
+	return d, pi
+
+
+def dijkstra_vertex_queue(G, s):
+	"""Solve single-source shortest-paths problem with no negative-weight edges, using
+	a VertexMinPriorityQueue whose keys are the distances in d themselves.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	"""
+	card_V = G.get_card_V()
+
+	d, pi = initialize_single_source(G, s)
+
+	queue = VertexMinPriorityQueue(d)
+	for u in range(card_V):
+		queue.insert(u)
+
+	while queue.get_size() > 0:
+		u = queue.extract_min()
+		d_u = d[u]
+
+		# Relax each edge, decreasing the key of v when d[v] decreases.
+		for v, weight in G.get_neighbors(u):
+			if d_u + weight < d[v]:
+				queue.decrease_key(v, d_u + weight)
+				pi[v] = u
+
+	return d, pi
+
+
+def dijkstra_lazy(G, s):
+	"""Solve single-source shortest-paths problem with no negative-weight edges,
+	using a binary heap of (distance, vertex) pairs with lazy deletion.  A vertex
+	is pushed each time its distance decreases, and stale entries are skipped
+	when popped, so only vertices reachable from s ever enter the heap.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	"""
+	d, pi = initialize_single_source(G, s)
+
+	frontier = [(0, s)]
+	while frontier:
+		d_u, u = heapq.heappop(frontier)
+		if d_u > d[u]:
+			continue  # stale entry, u was already settled with a smaller distance
+
+		# Relax each edge, pushing v again whenever its distance decreases.
+		for v, weight in G.get_neighbors(u):
+			d_v = d_u + weight
+			if d_v < d[v]:
+				d[v] = d_v
+				pi[v] = u
+				heapq.heappush(frontier, (d_v, v))
+
+	return d, pi
+
+
+def dijkstra_dial(G, s, max_weight=None):
+	"""Solve single-source shortest-paths problem with small nonnegative integer
+	weights by Dial's algorithm.  Vertices wait in buckets indexed by distance and
+	the buckets are scanned in increasing order, so no comparisons between keys are
+	needed.  Every pending distance lies within C of the one being scanned, where C
+	is the maximum weight, so C + 1 buckets reused cyclically suffice, and the
+	running time is O(V + E + D), where D <= (V - 1) * C is the largest finite distance.
+	Falls back to dijkstra_lazy if some weight is not a nonnegative integer, or if C
+	exceeds the number of edges, where the buckets would cost more than a heap.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	max_weight -- optional result of integer_max_weight(G), to skip checking the
+	weights again when running from many sources
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from source vertex s
+	pi -- predecessors
+	"""
+	if max_weight is None:
+		max_weight = integer_max_weight(G)
+	if max_weight is None or max_weight > G.get_card_E():
+		return dijkstra_lazy(G, s)
+
+	d, pi = initialize_single_source(G, s)
+
+	card_buckets = max_weight + 1
+	buckets = [[] for i in range(card_buckets)]
+	buckets[0].append(s)
+	pending = 1  # number of entries in all buckets, including stale ones
+	d_u = 0  # distance of the bucket being scanned
+	while pending > 0:
+		bucket = buckets[d_u % card_buckets]
+		# Zero-weight edges may add to this bucket while it is being emptied.
+		while bucket:
+			u = bucket.pop()
+			pending -= 1
+			if d[u] != d_u:
+				continue  # stale entry, u was already settled with a smaller distance
+
+			for v, weight in G.get_neighbors(u):
+				d_v = d_u + weight
+				if d_v < d[v]:
+					d[v] = d_v
+					pi[v] = u
+					buckets[d_v % card_buckets].append(v)
+					pending += 1
+		d_u += 1
 
 	return d, pi
 
 
+def integer_max_weight(G):
+	"""Return the maximum edge weight of G, or None if some weight is not a
+	nonnegative integer and so cannot index a bucket in dijkstra_dial."""
+	max_weight = 0
+	for u in range(G.get_card_V()):
+		for v, weight in G.get_neighbors(u):
+			if not isinstance(weight, Integral) or weight < 0:
+				return None
+			if weight > max_weight:
+				max_weight = weight
+	return max_weight
+
+
+def dijkstra_to_target(G, s, t):
+	"""Run Dijkstra's algorithm from source s, stopping as soon as target t is settled.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	t -- index of target vertex
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	d -- distances from source vertex s, final for t and every settled vertex
+	pi -- predecessors
+	settled -- number of vertices settled before stopping
+	"""
+	d, pi = initialize_single_source(G, s)
+	settled = 0
+
+	frontier = [(0, s)]
+	while frontier:
+		d_u, u = heapq.heappop(frontier)
+		if d_u > d[u]:
+			continue  # stale entry
+		settled += 1
+		if u == t:
+			break  # d[t] can no longer decrease
+
+		for v, weight in G.get_neighbors(u):
+			d_v = d_u + weight
+			if d_v < d[v]:
+				d[v] = d_v
+				pi[v] = u
+				heapq.heappush(frontier, (d_v, v))
+
+	return d, pi, settled
+
+
+def shortest_path(G, s, t, bidirectional=False, G_T=None):
+	"""Find a shortest path from s to t, settling only the vertices closer to s than t.
+
+	Arguments:
+	G -- a directed, weighted graph
+	s -- index of source vertex
+	t -- index of target vertex
+	bidirectional -- if True, also search backward from t and stop where the searches meet
+	G_T -- optional precomputed transpose of G for bidirectional search
+	Assumption:
+	All weights are nonnegative
+
+	Returns:
+	distance -- shortest-path distance from s to t, infinity if t is unreachable
+	path -- list of vertices on a shortest path from s to t, empty if t is unreachable
+	"""
+	if bidirectional:
+		return bidirectional_dijkstra(G, s, t, G_T)
+
+	d, pi, settled = dijkstra_to_target(G, s, t)
+	return d[t], path_to(pi, s, t)
+
+
 # Testing
 if __name__ == "__main__":
 
+	import time
 	from adjacency_list_graph import AdjacencyListGraph
 	from bellman_ford import bellman_ford
 	from generate_random_graph import generate_random_graph
+	from underground_data import load_network, insert_network_edges
 
 	# Textbook example. 
 	vertices = ['s', 't', 'x', 'y', 'z']
@@ -95,11 +312,47 @@ if __name__ == "__main__":
 
 	# Shortest-path distances should all be equal.
 	all_equal = True
+	max_weight = integer_max_weight(graph2)
 	for s in range(card_V):
 		dijkstra_d, dijkstra_pi = dijkstra(graph2, s)
+		lazy_d, lazy_pi = dijkstra(graph2, s, engine="lazy")
+		vertex_d, vertex_pi = dijkstra(graph2, s, engine="vertex")
+		dial_d, dial_pi = dijkstra(graph2, s, engine="dial", max_weight=max_weight)
 		bf_d, bf_pi, cycle = bellman_ford(graph2, s)
-		if bf_d != dijkstra_d:
+		if bf_d != dijkstra_d or bf_d != lazy_d or bf_d != vertex_d or bf_d != dial_d:
 			print("Shortest-path distances mismatch for source vertex", s)
 			all_equal = False
 		# Don't check whether pi values are equal because shortest paths might not be unique.
-	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
\ No newline at end of file
+	print("All shortest-path distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Point-to-point queries should agree with the full single-source distances.
+	all_equal = True
+	for s in range(card_V):
+		d, pi = dijkstra(graph2, s)
+		for t in range(card_V):
+			distance, path = shortest_path(graph2, s, t, bidirectional=(t % 2 == 0))
+			if distance != d[t] or (path and sum(graph2.find_edge(u, v).get_weight()
+					for u, v in zip(path, path[1:])) != distance):
+				print("Point-to-point mismatch for vertices", s, t)
+				all_equal = False
+	print("All point-to-point distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Weights far larger than the number of edges fall back to a heap instead of
+	# scanning millions of empty buckets.
+	graph3 = AdjacencyListGraph(3, True, True)
+	graph3.insert_edge(0, 1, 5000000)
+	graph3.insert_edge(1, 2, 5000000)
+	start = time.perf_counter()
+	dial_d, dial_pi = dijkstra(graph3, 0, engine="dial")
+	print(dial_d == dijkstra(graph3, 0, engine="lazy")[0], time.perf_counter() - start < 0.1)
+
+	# All Underground sources, checking the weights once for Dial's algorithm.
+	stations, edges = load_network()
+	graph4 = AdjacencyListGraph(len(stations), directed=False, weighted=True)
+	insert_network_edges(graph4, edges)
+	for engine in ("lazy", "dial"):
+		start = time.perf_counter()
+		max_weight = integer_max_weight(graph4)
+		for s in range(len(stations)):
+			dijkstra(graph4, s, engine, max_weight)
+		print("%s: %.3f s" % (engine, time.perf_counter() - start))
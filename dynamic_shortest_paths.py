@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+# dynamic_shortest_paths.py
+
+import heapq
+
+from dijkstra import dijkstra
+from path_reconstruction import path_to
+
+
+class DynamicShortestPaths:
+
+	def __init__(self, G, sources=None):
+		"""Solve single-source shortest paths from each of several sources, and keep the
+		distances up to date as edges of G are deleted and inserted.  After a change,
+		only the vertices whose distance can change are repaired, in the style of
+		Ramalingam and Reps: deleting an edge of a shortest-path tree invalidates just
+		the subtree below it, and inserting an edge just propagates the decreases it causes.
+
+		Arguments:
+		G -- a directed or undirected, weighted graph with nonnegative weights and no
+		multiple edges, changed only through this object from now on
+		sources -- sequence of source vertices, default all vertices
+		"""
+		self.G = G
+		card_V = G.get_card_V()
+		if sources is None:
+			sources = range(card_V)
+
+		# in_edges[v][u] is the weight of edge (u, v), both directions if G is undirected.
+		self.in_edges = [{} for v in range(card_V)]
+		for u in range(card_V):
+			for v, weight in G.get_neighbors(u):
+				self.in_edges[v][u] = weight
+
+		# Distances and predecessors from each source, keyed by source.
+		self.d = {}
+		self.pi = {}
+		for s in sources:
+			self.d[s], self.pi[s] = dijkstra(G, s, engine="lazy")
+
+	def get_sources(self):
+		"""Return the list of source vertices."""
+		return list(self.d)
+
+	def distance(self, s, t):
+		"""Return the shortest-path distance from source s to t, infinity if unreachable."""
+		return self.d[s][t]
+
+	def path(self, s, t):
+		"""Return the vertices on a shortest path from source s to t, empty if unreachable."""
+		return path_to(self.pi[s], s, t)
+
+	def delete_edge(self, u, v):
+		"""Delete edge (u, v), in both directions if G is undirected, and repair the
+		shortest paths from every source.
+
+		Returns:
+		The total number of vertices whose shortest paths had to be recomputed
+		"""
+		if not self.G.has_edge(u, v):
+			raise RuntimeError("There is no edge (" + str(u) + ", " + str(v) + ").")
+		self.G.delete_edge(u, v)
+		del self.in_edges[v][u]
+		if not self.G.is_directed():
+			del self.in_edges[u][v]
+
+		repaired = 0
+		for s in self.d:
+			repaired += self.repair_deletion(s, u, v)
+			if not self.G.is_directed():
+				repaired += self.repair_deletion(s, v, u)
+		return repaired
+
+	def insert_edge(self, u, v, weight):
+		"""Insert edge (u, v) with the given weight, in both directions if G is
+		undirected, and repair the shortest paths from every source.
+
+		Returns:
+		The total number of vertices whose distance decreased
+		"""
+		self.G.insert_edge(u, v, weight)
+		self.in_edges[v][u] = weight
+		if not self.G.is_directed():
+			self.in_edges[u][v] = weight
+
+		repaired = 0
+		for s in self.d:
+			repaired += self.repair_insertion(s, u, v, weight)
+			if not self.G.is_directed():
+				repaired += self.repair_insertion(s, v, u, weight)
+		return repaired
+
+	def repair_deletion(self, s, u, v):
+		"""Repair distances and predecessors from s after edge (u, v) was deleted.
+
+		Returns:
+		The number of vertices whose shortest paths were recomputed
+		"""
+		d, pi = self.d[s], self.pi[s]
+		if pi[v] != u:
+			return 0  # (u, v) was not in the tree, so no shortest path used it
+
+		# The affected vertices are the subtree of v, which lost their paths from s.
+		affected = {v}
+		stack = [v]
+		while stack:
+			x = stack.pop()
+			for y, weight in self.G.get_neighbors(x):
+				if pi[y] == x and y not in affected:
+					affected.add(y)
+					stack.append(y)
+
+		inf = float('inf')
+		for x in affected:
+			d[x] = inf
+			pi[x] = None
+
+		# The best way into each affected vertex directly from an unaffected one.
+		frontier = []
+		for x in affected:
+			for y, weight in self.in_edges[x].items():
+				if y not in affected and d[y] + weight < d[x]:
+					d[x] = d[y] + weight
+					pi[x] = y
+			if d[x] < inf:
+				frontier.append((d[x], x))
+		heapq.heapify(frontier)
+
+		# Dijkstra's algorithm over the affected vertices only; no other distance changes.
+		while frontier:
+			d_x, x = heapq.heappop(frontier)
+			if d_x > d[x]:
+				continue  # stale entry
+			for y, weight in self.G.get_neighbors(x):
+				if y in affected and d_x + weight < d[y]:
+					d[y] = d_x + weight
+					pi[y] = x
+					heapq.heappush(frontier, (d[y], y))
+
+		return len(affected)
+
+	def repair_insertion(self, s, u, v, weight):
+		"""Repair distances and predecessors from s after edge (u, v) was inserted.
+
+		Returns:
+		The number of vertices whose distance decreased
+		"""
+		d, pi = self.d[s], self.pi[s]
+		if d[u] + weight >= d[v]:
+			return 0
+		d[v] = d[u] + weight
+		pi[v] = u
+
+		# Propagate the decrease from v with Dijkstra's algorithm.
+		decreased = set()
+		frontier = [(d[v], v)]
+		while frontier:
+			d_x, x = heapq.heappop(frontier)
+			if d_x > d[x]:
+				continue  # stale entry
+			decreased.add(x)
+			for y, weight in self.G.get_neighbors(x):
+				if d_x + weight < d[y]:
+					d[y] = d_x + weight
+					pi[y] = x
+					heapq.heappush(frontier, (d[y], y))
+
+		return len(decreased)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	import time
+	from adjacency_list_graph import AdjacencyListGraph
+	from underground_data import load_network, insert_network_edges
+	from generate_random_graph import generate_random_graph
+
+	def check(dynamic):
+		"""Return True if the maintained distances and paths match dijkstra from scratch."""
+		G = dynamic.G
+		for s in dynamic.get_sources():
+			d, pi = dijkstra(G, s)
+			if d != dynamic.d[s]:
+				return False
+			for t in range(G.get_card_V()):
+				path = dynamic.path(s, t)
+				if path and sum(G.find_edge(x, y).get_weight() for x, y in zip(path, path[1:])) != d[t]:
+					return False
+		return True
+
+	# Random deletions and insertions on directed and undirected graphs.
+	all_equal = True
+	for directed in (True, False):
+		graph1 = generate_random_graph(60, 0.08, True, directed, True, 0, 15)
+		dynamic1 = DynamicShortestPaths(graph1)
+		for change in range(40):
+			edges1 = graph1.get_edge_list()
+			if edges1 and random.random() < 0.6:
+				u, v = random.choice(edges1)
+				dynamic1.delete_edge(u, v)
+			else:
+				u, v = random.sample(range(60), 2)
+				if not graph1.has_edge(u, v):
+					dynamic1.insert_edge(u, v, random.randint(0, 15))
+			all_equal = all_equal and check(dynamic1)
+	print("All dynamic distances are " + ("not " if not all_equal else "") + "equal")
+
+	# Close each connection of the Underground network in turn, then reopen it.
+	stations, edges = load_network()
+	graph2 = AdjacencyListGraph(len(stations), directed=False, weighted=True, indexed=True)
+	insert_network_edges(graph2, edges)
+	card_V = len(stations)
+	dynamic2 = DynamicShortestPaths(graph2)
+
+	start = time.perf_counter()
+	repaired = 0
+	closures = 0
+	for u, v in graph2.get_edge_list():
+		if u < v:
+			weight = graph2.find_edge(u, v).get_weight()
+			repaired += dynamic2.delete_edge(u, v)
+			repaired += dynamic2.insert_edge(u, v, weight)
+			closures += 1
+	dynamic_time = time.perf_counter() - start
+	print("All-pairs distances after closing and reopening every connection are " +
+		  ("" if check(dynamic2) else "not ") + "equal")
+
+	# Recompute from scratch for a sample of the closures.
+	sample = [(u, v) for u, v in graph2.get_edge_list() if u < v][:20]
+	start = time.perf_counter()
+	for u, v in sample:
+		graph_copy = graph2.copy()
+		graph_copy.delete_edge(u, v)
+		for s in range(card_V):
+			dijkstra(graph_copy, s, engine="lazy")
+	recompute_time = (time.perf_counter() - start) / len(sample) * closures
+	print("%d closures: %.2f s dynamic, about %.2f s recomputing, %.1f vertices repaired per closure and source"
+		  % (closures, dynamic_time, recompute_time, repaired / closures / card_V))
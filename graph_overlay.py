@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# graph_overlay.py
+
+from adjacency_list_graph import Edge
+
+
+class GraphOverlay:
+
+	def __init__(self, base):
+		"""Initialize a view of graph base in which edges can be closed and weights
+		changed without copying or changing base.  Only the changes are stored, so a
+		view takes memory proportional to the number of changes, and the adjacency
+		lists of untouched vertices are those of base.
+
+		Arguments:
+		base -- the underlying graph, an AdjacencyListGraph or CSRGraph
+		"""
+		self.base = base
+		# closed[u] is the set of vertices v for which edge (u, v) is closed.
+		self.closed = {}
+		# weights[u][v] is the changed weight of edge (u, v).
+		self.weights = {}
+		self.closed_count = 0  # number of closed edges, undirected edges counted once
+
+	def get_base(self):
+		"""Return the underlying graph."""
+		return self.base
+
+	def get_card_V(self):
+		"""Return the number of vertices in this graph."""
+		return self.base.get_card_V()
+
+	def get_card_E(self):
+		"""Return the number of open edges in this graph."""
+		return self.base.get_card_E() - self.closed_count
+
+	def is_directed(self):
+		"""Return a boolean indicating whether this graph is directed."""
+		return self.base.is_directed()
+
+	def is_weighted(self):
+		"""Return a boolean indicating whether this graph is weighted."""
+		return self.base.is_weighted()
+
+	def get_neighbors(self, u):
+		"""Return an iterator of (v, weight) pairs for the open edges leaving vertex u."""
+		closed = self.closed.get(u)
+		weights = self.weights.get(u)
+		if closed is None and weights is None:
+			return self.base.get_neighbors(u)
+		return self.changed_neighbors(u, closed or (), weights or {})
+
+	def changed_neighbors(self, u, closed, weights):
+		"""Generate the (v, weight) pairs of vertex u, which has closed edges or changed weights."""
+		for v, weight in self.base.get_neighbors(u):
+			if v not in closed:
+				yield v, weights.get(v, weight)
+
+	def get_adj_list(self, u):
+		"""Return an iterator for the adjacency list of vertex u, as Edge objects."""
+		if u not in self.closed and u not in self.weights:
+			return self.base.get_adj_list(u)
+		return (Edge(v, weight) for v, weight in self.get_neighbors(u))
+
+	def find_edge(self, u, v):
+		"""Return an Edge object for edge (u, v) if (u, v) is open in this graph, None otherwise."""
+		if self.is_closed(u, v):
+			return None
+		edge = self.base.find_edge(u, v)
+		if edge is None or v not in self.weights.get(u, ()):
+			return edge
+		return Edge(v, self.weights[u][v])
+
+	def has_edge(self, u, v):
+		"""Return True if edge (u, v) is open in this graph, False otherwise."""
+		return not self.is_closed(u, v) and self.base.has_edge(u, v)
+
+	def is_closed(self, u, v):
+		"""Return True if edge (u, v) has been closed."""
+		return v in self.closed.get(u, ())
+
+	def close_edge(self, u, v):
+		"""Close edge (u, v), in both directions if the graph is undirected."""
+		if not self.has_edge(u, v):
+			raise RuntimeError("There is no open edge (" + str(u) + ", " + str(v) + ").")
+		self.closed.setdefault(u, set()).add(v)
+		if not self.is_directed():
+			self.closed.setdefault(v, set()).add(u)
+		self.closed_count += 1
+
+	def reopen_edge(self, u, v):
+		"""Reopen closed edge (u, v), in both directions if the graph is undirected."""
+		if not self.is_closed(u, v):
+			raise RuntimeError("Edge (" + str(u) + ", " + str(v) + ") is not closed.")
+		pairs = [(u, v)] if self.is_directed() else [(u, v), (v, u)]
+		for x, y in pairs:
+			self.closed[x].discard(y)
+			if not self.closed[x]:
+				del self.closed[x]  # keep untouched vertices on the fast path
+		self.closed_count -= 1
+
+	def set_edge_weight(self, u, v, weight):
+		"""Change the weight of open edge (u, v), in both directions if the graph is undirected."""
+		if not self.has_edge(u, v):
+			raise RuntimeError("There is no open edge (" + str(u) + ", " + str(v) + ").")
+		self.weights.setdefault(u, {})[v] = weight
+		if not self.is_directed():
+			self.weights.setdefault(v, {})[u] = weight
+
+	def reset(self):
+		"""Reopen every closed edge and restore every changed weight."""
+		self.closed.clear()
+		self.weights.clear()
+		self.closed_count = 0
+
+	def get_edge_list(self):
+		"""Return a Python list containing the open edges of this graph."""
+		return [(u, v) for u, v in self.base.get_edge_list() if not self.is_closed(u, v)]
+
+	def transpose(self):
+		"""Return the transpose of this view, as a view of the transpose of the base graph."""
+		if not self.is_directed():
+			return self
+		view = GraphOverlay(self.base.transpose())
+		for u, closed in self.closed.items():
+			for v in closed:
+				view.closed.setdefault(v, set()).add(u)
+		for u, weights in self.weights.items():
+			for v, weight in weights.items():
+				view.weights.setdefault(v, {})[u] = weight
+		view.closed_count = self.closed_count
+		return view
+
+	def __str__(self):
+		"""Return the adjacency lists formatted as a string."""
+		return self.strmap()
+
+	def strmap(self, mapping_func=None):
+		"""Return the adjacency lists formatted as a string, but mapping vertex numbers
+		by a mapping function.  If mapping_func is None, then do not map."""
+		if mapping_func is None:
+			mapping_func = lambda i: i
+
+		result = ""
+		for i in range(self.get_card_V()):
+			result += str(mapping_func(i)) + ": "
+			for edge in self.get_adj_list(i):
+				result += edge.strmap(mapping_func) + " "
+			result += "\n"
+		return result
+
+
+# Testing
+if __name__ == "__main__":
+
+	import random
+	import tracemalloc
+	from adjacency_list_graph import AdjacencyListGraph
+	from underground_data import load_network, insert_network_edges
+	from dijkstra import dijkstra
+	from bellman_ford import bellman_ford
+	from generate_random_graph import generate_random_graph
+
+	# A view must behave exactly like a changed copy of the graph.
+	all_equal = True
+	for directed in (True, False):
+		graph1 = generate_random_graph(50, 0.1, True, directed, True, 0, 15)
+		view = GraphOverlay(graph1)
+		graph_copy = graph1.copy()
+		edges = graph1.get_edge_list()
+		for u, v in random.sample(edges, len(edges) // 4):
+			view.close_edge(u, v)
+			graph_copy.delete_edge(u, v)
+		for u, v in random.sample(view.get_edge_list(), 10):
+			weight = random.randint(0, 15)
+			view.set_edge_weight(u, v, weight)
+			graph_copy.set_edge_weight(u, v, weight)
+		all_equal = all_equal and str(view) == str(graph_copy) and view.get_card_E() == graph_copy.get_card_E() \
+			and (not directed or str(view.transpose()) == str(graph_copy.transpose()))
+		for s in range(50):
+			all_equal = all_equal and dijkstra(view, s)[0] == dijkstra(graph_copy, s)[0] \
+				and bellman_ford(view, s)[0] == bellman_ford(graph_copy, s)[0]
+		view.reset()
+		all_equal = all_equal and str(view) == str(graph1)
+	print("All views are " + ("not " if not all_equal else "") + "equal to changed copies")
+
+	# Memory used while sweeping the closure of every Underground connection.
+	stations, edges = load_network()
+	graph2 = AdjacencyListGraph(len(stations), directed=False, weighted=True)
+	insert_network_edges(graph2, edges)
+	for name, close in (("copy", None), ("overlay", GraphOverlay(graph2))):
+		tracemalloc.start()
+		for u, v in graph2.get_edge_list():
+			if close is None:
+				scenario = graph2.copy()
+				scenario.delete_edge(u, v)
+			else:
+				close.close_edge(u, v)
+				scenario = close
+			dijkstra(scenario, u, engine="lazy")
+			if close is not None:
+				close.reopen_edge(u, v)
+		current, peak = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+		print("%s: peak %d KiB" % (name, peak // 1024))
@@ -105,20 +105,23 @@ class Heap:
         Argument:
         i -- index of the element in the heap.
         """
-        l = self.left(i)
-        r = self.right(i)
+        # Loop down the tree instead of recursing, so deep heaps cannot hit the recursion limit.
+        while True:
+            l = self.left(i)
+            r = self.right(i)
 
-        if l < self.heap_size and self.compare(self.get_key(self.array[l]), self.get_key(self.array[i])):
-            swap_with = l
-        else:
-            swap_with = i
+            if l < self.heap_size and self.compare(self.get_key(self.array[l]), self.get_key(self.array[i])):
+                swap_with = l
+            else:
+                swap_with = i
 
-        if r < self.heap_size and self.compare(self.get_key(self.array[r]), self.get_key(self.array[swap_with])):
-            swap_with = r
+            if r < self.heap_size and self.compare(self.get_key(self.array[r]), self.get_key(self.array[swap_with])):
+                swap_with = r
 
-        if swap_with != i:
+            if swap_with == i:
+                break
             self.swap(i, swap_with)
-            self.heapify(swap_with)
+            i = swap_with
 
     def build_heap(self):
         """Convert a list or numpy array into a heap."""
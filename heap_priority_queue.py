@@ -66,6 +66,18 @@ class HeapPriorityQueue:
         self.compare = compare
         self.temp_insert_value = temp_insert_value
 
+    @classmethod
+    def from_iterable(cls, items, *args, **kwargs):
+        """Return a new priority queue holding items, built in linear time.
+
+        Arguments:
+        items -- iterable of objects to insert
+        args, kwargs -- arguments to the constructor of the class
+        """
+        queue = cls(*args, **kwargs)
+        queue.insert_many(items)
+        return queue
+
     def get_heap(self):
         """Return heap, used in testing."""
         return self.heap
@@ -143,6 +155,35 @@ class HeapPriorityQueue:
         # Maintain the heap property.
         self.update_key(x, k)
 
+    def insert_many(self, items):
+        """Insert all of items into the heap at once.  The objects are appended to
+        the array and the heap is rebuilt bottom-up, which takes linear time rather
+        than one update_key per object.
+
+        Arguments:
+        items -- iterable of objects to insert
+        """
+        items = list(items)
+
+        # Each object has one index in the dictionary, so it can be in the heap only once.
+        seen = set()
+        for x in items:
+            if x in self.dict or x in seen:
+                raise RuntimeError("Object " + str(x) + " is already in the priority queue.")
+            seen.add(x)
+
+        array = self.heap.get_array()
+
+        # Entries past the heap size are left over from extractions, so drop them first.
+        del array[self.heap.get_heap_size():]
+        start = len(array)
+        array.extend(items)
+        for i in range(start, len(array)):
+            self.dict[array[i]] = i
+
+        # Restore the heap property over the whole array.
+        self.heap.build_heap()
+
     def is_heap(self):
         """Verify that the array or list represents a heap."""
         return self.heap.is_heap()
@@ -150,3 +191,32 @@ class HeapPriorityQueue:
     def __str__(self):
         """Return the heap as an array."""
         return str(self.heap)
+
+
+# Testing
+if __name__ == "__main__":
+
+    import random
+
+    keys = {x: random.randint(0, 100) for x in range(50)}
+    queue = HeapPriorityQueue(lambda a, b: a < b, float('-inf'), lambda x: keys[x])
+    queue.insert_many(range(30))
+    print(queue.is_heap())
+
+    # Extractions leave stale entries past the heap size, which insert_many must drop.
+    extracted = [queue.extract_top() for i in range(10)]
+    queue.insert_many(range(30, 50))
+    print(queue.is_heap(), queue.get_size() == 40)
+    extracted += [queue.extract_top() for i in range(40)]
+    print(sorted(extracted) == list(range(50)),
+          [keys[x] for x in extracted[10:]] == sorted(keys[x] for x in extracted[10:]))
+
+    # An object already in the queue, or repeated in items, is rejected before any change.
+    queue = HeapPriorityQueue.from_iterable(range(5), lambda a, b: a < b, float('-inf'), lambda x: keys[x])
+    for items in ([5, 2], [6, 6]):
+        try:
+            queue.insert_many(items)
+            print("Duplicate accepted")
+        except RuntimeError as error:
+            print(error)
+    print(queue.get_size() == 5 and queue.is_heap())
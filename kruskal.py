@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# kruskal.py
+
+from disjoint_set_forest import DisjointSetForest
+
+
+def kruskal(G):
+	"""Find a minimum spanning forest of an undirected, weighted graph with Kruskal's
+	algorithm: take the edges in order of increasing weight, keeping each one
+	that joins two different trees.  Runs in O(E lg E) time.
+
+	Arguments:
+	G -- an undirected, weighted graph
+
+	Returns:
+	tree -- list of the edges (u, v, weight), with u < v, of a minimum spanning forest
+	other -- list of the remaining edges (u, v, weight), with u < v, each of which
+	joins two vertices already connected by the forest, so that all of them can be
+	removed together without disconnecting any vertices
+	"""
+	if G.is_directed():
+		raise RuntimeError("Kruskal's algorithm needs an undirected graph.")
+
+	edges = []
+	for u in range(G.get_card_V()):
+		for v, weight in G.get_neighbors(u):
+			if u < v:
+				edges.append((weight, u, v))
+	edges.sort()
+
+	forest = DisjointSetForest(G.get_card_V())
+	tree = []
+	other = []
+	for weight, u, v in edges:
+		if forest.union(u, v):
+			tree.append((u, v, weight))
+		else:
+			other.append((u, v, weight))
+	return tree, other
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from adjacency_list_graph import AdjacencyListGraph
+	from underground_data import load_network, insert_network_edges
+	from disjoint_set_forest import component_index
+	from generate_random_graph import generate_random_graph
+	from graph_overlay import GraphOverlay
+
+	# Textbook example.
+	vertices = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'i']
+	edges = [('a', 'b', 4), ('a', 'h', 8), ('b', 'c', 8), ('b', 'h', 11), ('c', 'd', 7),
+			 ('c', 'f', 4), ('c', 'i', 2), ('d', 'e', 9), ('d', 'f', 14), ('e', 'f', 10),
+			 ('f', 'g', 2), ('g', 'h', 1), ('g', 'i', 6), ('h', 'i', 7)]
+	graph1 = AdjacencyListGraph(len(vertices), directed=False, weighted=True)
+	for edge in edges:
+		graph1.insert_edge(vertices.index(edge[0]), vertices.index(edge[1]), edge[2])
+	tree, other = kruskal(graph1)
+	# The total weight should be 37.
+	print("Total weight:", sum(weight for u, v, weight in tree))
+	print(", ".join(vertices[u] + vertices[v] for u, v, weight in tree))
+	print()
+
+	# Removing the other edges keeps the components of random graphs.
+	all_equal = True
+	for trial in range(20):
+		graph2 = generate_random_graph(100, 0.03, True, False, True, 0, 15)
+		tree, other = kruskal(graph2)
+		view = GraphOverlay(graph2)
+		for u, v, weight in other:
+			view.close_edge(u, v)
+		ids, count = component_index(graph2)
+		tree_ids, tree_count = component_index(view)
+		all_equal = all_equal and ids == tree_ids and len(tree) == 100 - count
+	print("All spanning forests are " + ("not " if not all_equal else "") + "correct")
+
+	# The Underground network.
+	stations, edges = load_network()
+	graph3 = AdjacencyListGraph(len(stations), directed=False, weighted=True)
+	insert_network_edges(graph3, edges)
+	start = time.perf_counter()
+	tree, other = kruskal(graph3)
+	print("%d connections kept, %d can be closed (%.4f s)" % (len(tree), len(other), time.perf_counter() - start))
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# multi_source_shortest_paths.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from csr_graph import CSRGraph
+from dijkstra import dijkstra, integer_max_weight
+
+# Graph, engine, and maximum weight shared by all tasks in a worker process,
+# set once by _init_worker.
+_worker_graph = None
+_worker_engine = None
+_worker_max_weight = None
+
+
+def _init_worker(G, engine, max_weight):
+	"""Store the graph shipped to this worker process."""
+	global _worker_graph, _worker_engine, _worker_max_weight
+	_worker_graph = G
+	_worker_engine = engine
+	_worker_max_weight = max_weight
+
+
+def _solve(s):
+	"""Solve single-source shortest paths from s on the worker's graph."""
+	return solve_source(_worker_graph, s, _worker_engine, _worker_max_weight)
+
+
+def solve_source(G, s, engine="lazy", max_weight=None):
+	"""Run dijkstra from s and return its distances and predecessors as NumPy rows,
+	with -1 in place of a missing predecessor."""
+	d, pi = dijkstra(G, s, engine, max_weight)
+	return (np.array(d, dtype=float),
+			np.array([-1 if p is None else p for p in pi], dtype=np.int64))
+
+
+def multi_source_shortest_paths(G, sources, workers=None, engine="lazy"):
+	"""Solve single-source shortest paths once for each of several sources, spread
+	across a pool of worker processes.  The graph is converted to compressed sparse
+	row form and sent to each worker once, not with every source.
+
+	Arguments:
+	G -- a directed, weighted graph with nonnegative weights
+	sources -- sequence of source vertices
+	workers -- number of worker processes, default os.cpu_count(); 1 solves in this process
+	engine -- dijkstra engine to run for each source
+	Returns:
+	D -- array of shape (len(sources), |V|), where D[i, v] is the shortest-path
+	distance from sources[i] to v
+	Pi -- array of the same shape, where Pi[i, v] is the predecessor of v on a
+	shortest path from sources[i], or -1 if there is none
+	"""
+	sources = list(sources)
+	card_V = G.get_card_V()
+	if workers is None:
+		workers = os.cpu_count() or 1
+	if not isinstance(G, CSRGraph):
+		G = CSRGraph.from_graph(G)
+
+	# Check the weights for Dial's algorithm once, not once per source.
+	max_weight = None
+	if engine == "dial":
+		max_weight = integer_max_weight(G)
+		if max_weight is None:
+			engine = "lazy"  # the weights cannot index buckets
+
+	if workers == 1 or len(sources) <= 1:
+		rows = [solve_source(G, s, engine, max_weight) for s in sources]
+	else:
+		chunksize = max(1, len(sources) // (4 * workers))
+		with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+								 initargs=(G, engine, max_weight)) as executor:
+			rows = list(executor.map(_solve, sources, chunksize=chunksize))
+
+	D = np.empty((len(sources), card_V), dtype=float)
+	Pi = np.empty((len(sources), card_V), dtype=np.int64)
+	for i, (d, pi) in enumerate(rows):
+		D[i] = d
+		Pi[i] = pi
+	return D, Pi
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	from all_pairs_shortest_paths import create_weight_matrix, floyd_warshall
+	from generate_random_graph import generate_random_graph
+
+	card_V = 400
+	graph = generate_random_graph(card_V, 0.02, True, True, True, 0, 15)
+	L, _ = floyd_warshall(create_weight_matrix(graph))
+
+	for workers in (1, 2, 4):
+		start = time.perf_counter()
+		D, Pi = multi_source_shortest_paths(graph, range(card_V), workers=workers)
+		elapsed = time.perf_counter() - start
+		print("%d workers: %.3f s, distances %s Floyd-Warshall"
+			  % (workers, elapsed, "match" if np.array_equal(D, L) else "do not match"))
+
+	# Dial's algorithm gives the same distances.
+	D, Pi = multi_source_shortest_paths(graph, range(card_V), workers=1, engine="dial")
+	print(np.array_equal(D, L))
+
+	# A subset of sources gives the matching rows.
+	D, Pi = multi_source_shortest_paths(graph, [5, 0, 17], workers=2)
+	print(np.array_equal(D, L[[5, 0, 17]]))
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# path_reconstruction.py
+
+import numpy as np
+
+
+def has_predecessor(p):
+	"""Return True if predecessor entry p names a vertex, as opposed to None or -1."""
+	return p is not None and p >= 0
+
+
+def path_to(pi, s, t):
+	"""Return the vertices on the path from s to t in a predecessor tree, in time
+	proportional to the length of the path.
+
+	Arguments:
+	pi -- predecessors from a single-source search from s, either a list with None
+	or a row of a predecessor matrix with -1 where there is no predecessor
+	s -- index of source vertex
+	t -- index of target vertex
+	Returns:
+	List of vertices from s to t, empty if t is unreachable from s
+	"""
+	path = [t]
+	while path[-1] != s:
+		p = pi[path[-1]]
+		if not has_predecessor(p):
+			return []
+		path.append(int(p))
+	path.reverse()
+	return path
+
+
+def hop_count(pi, s, t):
+	"""Return the number of edges on the path from s to t in a predecessor tree,
+	-1 if t is unreachable from s."""
+	hops = 0
+	while t != s:
+		t = pi[t]
+		if not has_predecessor(t):
+			return -1
+		hops += 1
+	return hops
+
+
+def station_path(pi, s, t, stations):
+	"""Return the names of the stations on the path from s to t in a predecessor
+	tree, empty if t is unreachable from s.
+
+	Arguments:
+	pi -- predecessors, as for path_to
+	s -- index of source station
+	t -- index of target station
+	stations -- station names, indexed by vertex
+	"""
+	return [stations[v] for v in path_to(pi, s, t)]
+
+
+def hop_counts(pi, s):
+	"""Return the number of edges on the path from the source to every target of one
+	or more predecessor trees: 0 for the source itself and -1 where there is no
+	path.  All paths are followed back one edge at a time together, so the work is
+	vectorised over every target.
+
+	Arguments:
+	pi -- predecessors, as for path_to, or a predecessor matrix with one row per source
+	s -- index of source vertex, or an array with the source of each row of pi
+	Returns:
+	Array of the same shape as pi with the hop count of each target
+	"""
+	if not isinstance(pi, np.ndarray):
+		pi = np.array([-1 if p is None else p for p in pi], dtype=np.int64)
+	card_V = pi.shape[-1]
+	sources = np.asarray(s)[..., np.newaxis]
+	current = np.broadcast_to(np.arange(card_V), pi.shape).copy()
+
+	hops = np.where(pi >= 0, 0, -1)
+	hops[current == sources] = 0
+	active = (pi >= 0) & (current != sources)
+	while active.any():
+		current[active] = np.take_along_axis(pi, current, axis=-1)[active]
+		hops[active] += 1
+		active &= current != sources
+	return hops
+
+
+# Testing
+if __name__ == "__main__":
+
+	from generate_random_graph import generate_random_graph
+	from dijkstra import dijkstra
+	from all_pairs_shortest_paths import create_weight_matrix, floyd_warshall
+
+	card_V = 100
+	graph = generate_random_graph(card_V, 0.03, True, True, True, 0, 15)
+	D, Pi = floyd_warshall(create_weight_matrix(graph))
+	hop_matrix = hop_counts(Pi, np.arange(card_V))
+
+	all_equal = True
+	for s in range(card_V):
+		d, pi = dijkstra(graph, s)
+		row_hops = hop_counts(pi, s)
+		for t in range(card_V):
+			path = path_to(pi, s, t)
+			row_path = path_to(Pi[s], s, t)
+			for p, hops in ((path, hop_count(pi, s, t)), (row_path, hop_count(Pi[s], s, t))):
+				if (len(p) - 1 if p else -1) != hops:
+					all_equal = False
+				if p and (p[0] != s or p[-1] != t or sum(graph.find_edge(u, v).get_weight()
+						for u, v in zip(p, p[1:])) != d[t]):
+					all_equal = False
+			if row_hops[t] != hop_count(pi, s, t) or hop_matrix[s, t] != hop_count(Pi[s], s, t):
+				all_equal = False
+	print("All reconstructed paths and hop counts are " + ("not " if not all_equal else "") + "consistent")
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# shortest_path_tree.py
+
+from collections import OrderedDict
+
+from dijkstra import dijkstra
+from breadth_first_search import fewest_stops
+from path_reconstruction import path_to, hop_counts
+
+
+class ShortestPathTree:
+
+	def __init__(self, G, s, engine="lazy"):
+		"""Solve single-source shortest paths from s once, to answer queries for any target.
+
+		Arguments:
+		G -- a directed, weighted graph with nonnegative weights
+		s -- index of source vertex
+		engine -- dijkstra engine to solve with, or "stops" for paths with the fewest
+		edges, the lightest of them on a tie, found by breadth-first search
+		"""
+		self.source = s
+		self.hop_array = None  # computed for every target on the first call to hops
+		if engine == "stops":
+			hops, self.d, self.pi = fewest_stops(G, s)
+			self.hop_array = [-1 if h == float('inf') else h for h in hops]
+		else:
+			self.d, self.pi = dijkstra(G, s, engine)
+
+	def get_source(self):
+		"""Return the source vertex of the tree."""
+		return self.source
+
+	def distance(self, t):
+		"""Return the distance along the tree path from the source to t, infinity if unreachable."""
+		return self.d[t]
+
+	def path(self, t):
+		"""Return the vertices on a shortest path from the source to t, empty if unreachable."""
+		return path_to(self.pi, self.source, t)
+
+	def hops(self, t):
+		"""Return the number of edges on the shortest path from the source to t, -1 if unreachable."""
+		if self.hop_array is None:
+			self.hop_array = hop_counts(self.pi, self.source)
+		return int(self.hop_array[t])
+
+
+class ShortestPathTreeCache:
+
+	def __init__(self, G, maxsize=64, engine="lazy"):
+		"""Initialize a cache of shortest-path trees of graph G, keyed by source.  Once
+		it holds maxsize trees, the least recently used tree is evicted.  The trees
+		are not updated when G changes, so call clear after changing G.
+
+		Arguments:
+		G -- a directed, weighted graph with nonnegative weights
+		maxsize -- maximum number of trees kept
+		engine -- dijkstra engine to solve with, or "stops" as for ShortestPathTree
+		"""
+		self.G = G
+		self.maxsize = maxsize
+		self.engine = engine
+		self.trees = OrderedDict()
+
+	def get(self, s):
+		"""Return the shortest-path tree from s, solving for it only if it is not cached."""
+		tree = self.trees.get(s)
+		if tree is not None:
+			self.trees.move_to_end(s)
+			return tree
+		tree = ShortestPathTree(self.G, s, self.engine)
+		self.trees[s] = tree
+		if len(self.trees) > self.maxsize:
+			self.trees.popitem(last=False)  # least recently used
+		return tree
+
+	def clear(self):
+		"""Remove all cached trees."""
+		self.trees.clear()
+
+	def __len__(self):
+		"""Return the number of cached trees."""
+		return len(self.trees)
+
+
+# Testing
+if __name__ == "__main__":
+
+	from generate_random_graph import generate_random_graph
+
+	card_V = 100
+	graph = generate_random_graph(card_V, 0.05, True, True, True, 0, 15)
+	cache = ShortestPathTreeCache(graph, maxsize=10)
+
+	all_equal = True
+	for s in list(range(card_V)) + list(range(card_V - 5, card_V)):
+		tree = cache.get(s)
+		d, pi = dijkstra(graph, s)
+		for t in range(card_V):
+			path = tree.path(t)
+			if tree.distance(t) != d[t] or tree.hops(t) != len(path) - 1 \
+					or (path and sum(graph.find_edge(u, v).get_weight()
+									 for u, v in zip(path, path[1:])) != d[t]):
+				print("Tree mismatch for vertices", s, t)
+				all_equal = False
+	print("All tree queries are " + ("not " if not all_equal else "") + "equal")
+
+	# The last sources used are still cached, the earlier ones were evicted.
+	print(len(cache), list(cache.trees) == list(range(card_V - 10, card_V)))
+	print(cache.get(card_V - 1) is cache.get(card_V - 1))
+
+	# Trees of fewest stops agree with breadth-first search.
+	cache = ShortestPathTreeCache(graph, engine="stops")
+	all_equal = True
+	for s in range(card_V):
+		tree = cache.get(s)
+		hops, d, pi = fewest_stops(graph, s)
+		for t in range(card_V):
+			if tree.distance(t) != d[t] or tree.path(t) != path_to(pi, s, t) \
+					or tree.hops(t) != (hops[t] if tree.path(t) else -1):
+				print("Fewest-stops mismatch for vertices", s, t)
+				all_equal = False
+	print("All fewest-stops queries are " + ("not " if not all_equal else "") + "equal")
@@ -1,6 +1,8 @@
-import pandas as pd
+import numpy as np
 from adjacency_list_graph import AdjacencyListGraph
-from dijkstra import dijkstra
+from underground_data import load_network, insert_network_edges
+from apsp_cache import load_or_compute_apsp
+from dijkstra import shortest_path
 import matplotlib.pyplot as plt
 
 class UndergroundMap:
@@ -9,55 +11,36 @@ class UndergroundMap:
         self.station_mapping = station_mapping
         # initialize the graph
         self.graph = AdjacencyListGraph(len(station_mapping), directed=True,
-                                        weighted=True)  # Set directed and weighted accordingly
+                                        weighted=True, indexed=True)  # Set directed and weighted accordingly
+
+# Load the stations and connections, from a binary snapshot of the Excel sheet when it is up to date
+stations, edges = load_network("London Underground data.xlsx")
 
-# Load the data from the provided Excel sheet into a pandas DataFrame
-excel_data = pd.read_excel("London Underground data.xlsx")
 # Create a mapping between station names and integer indices
-stations = sorted(set(excel_data["StationA"]).union(excel_data["StationB"]))
 station_mapping = {station: i for i, station in enumerate(stations)}
 underground_map = UndergroundMap(station_mapping)
 
-# Create a graph representation from the DataFrame
-for index, row in excel_data.iterrows():
-    stationA, stationB, Time = row["StationA"], row["StationB"], row["Time"]
-    # Map station names to integer indices
-    stationA_index = underground_map.station_mapping[stationA]
-    stationB_index = underground_map.station_mapping[stationB]
-
-    # Check if the edge already exists before insertion
-    if not underground_map.graph.has_edge(stationA_index, stationB_index):
-        underground_map.graph.insert_edge(stationA_index, stationB_index, Time)
+# Create a graph representation, inserting each connection once
+insert_network_edges(underground_map.graph, edges)
 
 def plan_route(underground_map, start_station, end_station):
     start = underground_map.station_mapping[start_station]
     end = underground_map.station_mapping[end_station]
 
-    d, pi = dijkstra(underground_map.graph, start)
-
-    # Retrieve the path using the predecessors
-    path = []
-    current = end
-    while current is not None:
-        path.insert(0, current)
-        current = pi[current]
+    duration, path = shortest_path(underground_map.graph, start, end)
 
-    if d[end] != float('inf'):
-        print(f"Shortest journey duration from {start_station} to {end_station}: {d[end]} minutes")
+    if duration != float('inf'):
+        print(f"Shortest journey duration from {start_station} to {end_station}: {duration} minutes")
         print("Stations to go through:", " -> ".join([stations[i] for i in path]))
     else:
         print(f"No valid path found from {start_station} to {end_station}")
 
-# Calculate journey times for all station pairs
-journey_times = []
-for start_station in range(len(stations)):
-    for end_station in range(len(stations)):
-        if start_station != end_station:
-            d, _ = dijkstra(underground_map.graph, start_station)
+# Calculate journey times for all station pairs, computed once and cached on disk
+D, _, _ = load_or_compute_apsp(underground_map.graph)
 
-            # Check if the end_station is reachable from the start_station
-            if d[end_station] != float('inf'):
-                journey_times.append(d[end_station])
+# Keep the pairs of distinct stations where the end_station is reachable from the start_station
+reachable = np.isfinite(D) & ~np.eye(len(stations), dtype=bool)
+journey_times = D[reachable]
 
 # Create a histogram of journey times
 plt.hist(journey_times, bins=30, color='skyblue', edgecolor='black')
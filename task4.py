@@ -1,71 +1,56 @@
-import pandas as pd
 from adjacency_list_graph import AdjacencyListGraph
+from underground_data import load_network, insert_network_edges
+from bridges import find_bridges
+from kruskal import kruskal
+from disjoint_set_forest import component_index
+from graph_overlay import GraphOverlay
 
 class UndergroundMap:
     def __init__(self, station_mapping):
         # Create a mapping between station names and integer indices
         self.station_mapping = station_mapping
         # initialise the graph
-        self.graph = AdjacencyListGraph(len(station_mapping), directed=False, weighted=True)
+        self.graph = AdjacencyListGraph(len(station_mapping), directed=False, weighted=True, indexed=True)
+
+# Load the stations and connections, from a binary snapshot of the Excel sheet when it is up to date
+stations, edges = load_network("London Underground data.xlsx")
 
-# Load the data from the provided Excel sheet into a pandas DataFrame
-excel_data = pd.read_excel("London Underground data.xlsx")
 # Create a mapping between station names and integer indices
-stations = sorted(set(excel_data["StationA"]).union(excel_data["StationB"]))
 station_mapping = {station: i for i, station in enumerate(stations)}
 underground_map = UndergroundMap(station_mapping)
 
-# Create a graph representation from the DataFrame
-for index, row in excel_data.iterrows():
-    stationA, stationB, Time = row["StationA"], row["StationB"], row["Time"]
-    # Map station names to integer indices
-    stationA_index = underground_map.station_mapping[stationA]
-    stationB_index = underground_map.station_mapping[stationB]
-
-    # Check if the edge already exists before insertion
-    if not underground_map.graph.has_edge(stationA_index, stationB_index):
-        underground_map.graph.insert_edge(stationA_index, stationB_index, Time)
+# Create a graph representation, inserting each connection once
+insert_network_edges(underground_map.graph, edges)
 
-def is_adjacent(station1, station2, excel_data):
+def is_adjacent(station1, station2, underground_map):
     """
-    Check if two stations are adjacent based on their order of appearance in the original data.
+    Check if two stations are adjacent, that is, directly connected in the undirected network graph.
     """
-    return any(
-        ((row["StationA"] == station1 and row["StationB"] == station2) or
-         (row["StationA"] == station2 and row["StationB"] == station1))
-        for _, row in excel_data.iterrows()
-    )
+    return underground_map.graph.has_edge(underground_map.station_mapping[station1],
+                                          underground_map.station_mapping[station2])
 
-def justify_closure(graph_copy, stations, excel_data):
+def justify_closure(stations, underground_map, bridges, spanning_tree):
     """
-    Check if closure is justified based on the conditions.
+    Check if closure is justified based on the conditions, that is, if the stations stay connected
+    once the connections between them are closed, together with every other justified closure.
     """
     for i in range(len(stations) - 1):
         start_station = stations[i]
         end_station = stations[i + 1]
 
         # Check if stations are adjacent
-        if is_adjacent(start_station, end_station, excel_data):
-            # Omitted Kruskal's algorithm
-
-            # Check if there is a path between start_station and end_station
-            path = []
-            visited = set()
-
-            # Helper function to perform DFS on the graph
-            def dfs(current):
-                visited.add(current)
-                path.append(current)
-
-                for edge in graph_copy.get_adj_list(current):
-                    neighbor = edge.get_v()
-                    if neighbor not in visited:
-                        dfs(neighbor)
-
-            dfs(underground_map.station_mapping[start_station])
-
-            if underground_map.station_mapping[end_station] not in visited:
+        if is_adjacent(start_station, end_station, underground_map):
+            # Closing a bridge leaves no path between start_station and end_station
+            u = underground_map.station_mapping[start_station]
+            v = underground_map.station_mapping[end_station]
+            if (min(u, v), max(u, v)) in bridges:
                 print(f"No path from {start_station} to {end_station}")
+                return False
+
+            # Kruskal's algorithm keeps a minimum spanning tree, and the connections off the tree
+            # can all be closed at once without cutting off any station
+            if (min(u, v), max(u, v)) in spanning_tree:
+                return False
 
     return True
 
@@ -94,22 +79,34 @@ def plan_route(underground_map, start_station, end_station):
     else:
         print(f"No valid path found from {start_station} to {end_station}")
 
+# Classify every connection in one pass: closing a bridge disconnects the network
+network_bridges = set(find_bridges(underground_map.graph))
+
+# One sort-and-union pass splits the connections into a minimum spanning tree and closable ones
+tree_connections, closable_connections = kruskal(underground_map.graph)
+spanning_tree = {(u, v) for u, v, time in tree_connections}
+
 # Loop through every edge and simulate closure
 for edge in underground_map.graph.get_edge_list():
     u, v = edge
     # Check if the stations are adjacent
-    station_u = next((station for station, index in station_mapping.items() if index == u), None)
-    station_v = next((station for station, index in station_mapping.items() if index == v), None)
-
-    if is_adjacent(station_u, station_v, excel_data):
-        # Create a copy of the graph to simulate closure
-        graph_copy = underground_map.graph.copy()
-        graph_copy.delete_edge(u, v)
+    station_u = stations[u]
+    station_v = stations[v]
 
+    if is_adjacent(station_u, station_v, underground_map):
         # Check if the closure satisfies the conditions
-        is_feasible = justify_closure(graph_copy, [station_u, station_v], excel_data)
+        is_feasible = justify_closure([station_u, station_v], underground_map, network_bridges, spanning_tree)
 
         if is_feasible:
             print(f"Closure can be executed for edge: {station_u} -- {station_v}")
         else:
-            print(f"Closure cannot be executed for edge: {station_u} -- {station_v}")
\ No newline at end of file
+            print(f"Closure cannot be executed for edge: {station_u} -- {station_v}")
+
+# Close every connection off the spanning tree together, and check that no station is cut off
+closed_network = GraphOverlay(underground_map.graph)
+for u, v, time in closable_connections:
+    closed_network.close_edge(u, v)
+_, components_before = component_index(underground_map.graph)
+_, components_after = component_index(closed_network)
+print(f"Closing all {len(closable_connections)} justified connections leaves "
+      f"{components_after} connected network(s), as before: {components_after == components_before}")
@@ -1,36 +1,28 @@
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 from adjacency_list_graph import AdjacencyListGraph
-from dijkstra import dijkstra
+from apsp_cache import load_or_compute_apsp
+from underground_data import load_network, insert_network_edges
+from graph_overlay import GraphOverlay
+from kruskal import kruskal
 
 class UndergroundMap:
     def __init__(self, station_mapping):
         self.station_mapping = station_mapping
-        self.graph = AdjacencyListGraph(len(station_mapping), directed=False, weighted=True)
+        self.graph = AdjacencyListGraph(len(station_mapping), directed=False, weighted=True, indexed=True)
 
 # Function to calculate journey metrics
-def calculate_journey_metrics(underground_map, stations):
-    journey_times = []
-    stops_counts = []
+def calculate_journey_metrics(underground_map, network, stations):
+    # Shortest paths of every station pair, computed once per network and cached on disk
+    distances, hops, _ = load_or_compute_apsp(network)
+    indices = [underground_map.station_mapping[station] for station in stations]
+    distances = distances[np.ix_(indices, indices)]
+    hops = hops[np.ix_(indices, indices)]
+    pairs = ~np.eye(len(stations), dtype=bool)
 
-    for start_station in stations:
-        start_index = underground_map.station_mapping[start_station]
-        distances, predecessors = dijkstra(underground_map.graph, start_index)
-
-        for end_station in stations:
-            if start_station != end_station:
-                end_index = underground_map.station_mapping[end_station]
-                journey_time = distances[end_index] if end_index < len(distances) else float('inf')
-                journey_times.append(journey_time)
-
-                # Calculate number of stops
-                num_stops = 0
-                current = end_index
-                while current != start_index and current != None:
-                    current = predecessors[current]
-                    num_stops += 1
-                num_stops -= 1  # Adjust count since start station is included
-                stops_counts.append(max(0, num_stops))  # Ensure non-negative
+    journey_times = distances[pairs].tolist()
+    # Number of stops counts the stations between start and end, zero if there is no path
+    stops_counts = np.maximum(hops[pairs] - 1, 0).tolist()
 
     return journey_times, stops_counts
 
@@ -45,23 +37,24 @@ def create_histogram(data, title, xlabel, ylabel):
 
 
 # Load data and create graph
-excel_data = pd.read_excel("London Underground data.xlsx")
-stations = sorted(set(excel_data["StationA"]).union(excel_data["StationB"]))
+stations, edges = load_network("London Underground data.xlsx")
 station_mapping = {station: i for i, station in enumerate(stations)}
 underground_map = UndergroundMap(station_mapping)
-
-for index, row in excel_data.iterrows():
-    stationA, stationB, Time = row["StationA"], row["StationB"], row["Time"]
-    stationA_index = underground_map.station_mapping[stationA]
-    stationB_index = underground_map.station_mapping[stationB]
-    if not underground_map.graph.has_edge(stationA_index, stationB_index):
-        underground_map.graph.insert_edge(stationA_index, stationB_index, Time)
+insert_network_edges(underground_map.graph, edges)
 
 # Calculate metrics before closures
-pre_closure_times, pre_closure_stops = calculate_journey_metrics(underground_map, stations)
+pre_closure_times, pre_closure_stops = calculate_journey_metrics(underground_map, underground_map.graph, stations)
+
+# Closures are applied to a view of the network, so the original graph is neither copied nor changed
+closed_network = GraphOverlay(underground_map.graph)
+
+# Close every connection off a minimum spanning tree, which keeps all stations reachable
+_, closable_connections = kruskal(underground_map.graph)
+for u, v, time in closable_connections:
+    closed_network.close_edge(u, v)
 
 # Calculate metrics after closures
-post_closure_times, post_closure_stops = calculate_journey_metrics(underground_map, stations)
+post_closure_times, post_closure_stops = calculate_journey_metrics(underground_map, closed_network, stations)
 
 # Create and display histograms for journey times
 create_histogram(pre_closure_times, "Pre-Closure Journey Times", "Time (minutes)", "Frequency")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# underground_data.py
+
+import hashlib
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+
+DATA_FILE = "London Underground data.xlsx"
+
+
+def snapshot_path(data_file):
+	"""Return the path of the binary snapshot kept next to data_file."""
+	return os.path.splitext(data_file)[0] + ".npz"
+
+
+def file_hash(path):
+	"""Return a hex digest of the contents of the file at path."""
+	with open(path, "rb") as file:
+		return hashlib.sha256(file.read()).hexdigest()
+
+
+def read_sheet(data_file):
+	"""Read the StationA, StationB, and Time columns of the Excel sheet column-wise.
+
+	Returns:
+	stations -- sorted list of all station names
+	edges -- tuple (sources, targets, times) of NumPy arrays, one entry per row of
+	the sheet, with stations given by their index in stations
+	"""
+	import pandas as pd  # only needed when the snapshot is missing or stale
+	excel_data = pd.read_excel(data_file, usecols=["StationA", "StationB", "Time"])
+	station_a = excel_data["StationA"].to_numpy(dtype=str)
+	station_b = excel_data["StationB"].to_numpy(dtype=str)
+	names = np.unique(np.concatenate((station_a, station_b)))  # sorted
+	sources = np.searchsorted(names, station_a)
+	targets = np.searchsorted(names, station_b)
+	times = excel_data["Time"].to_numpy()
+	return names.tolist(), (sources, targets, times)
+
+
+def load_network(data_file=DATA_FILE):
+	"""Return the stations and connections of the network in data_file.  The parsed
+	sheet is saved in a NumPy .npz snapshot next to data_file, together with a hash
+	of the sheet, and later calls read the snapshot instead of parsing the sheet
+	again for as long as the sheet is unchanged.
+
+	Arguments:
+	data_file -- path of the Excel sheet with StationA, StationB, and Time columns
+	Returns:
+	stations -- sorted list of all station names
+	edges -- tuple (sources, targets, times) of NumPy arrays, one entry per row of
+	the sheet, with stations given by their index in stations
+	"""
+	source_hash = file_hash(data_file)
+	snapshot_file = snapshot_path(data_file)
+	try:
+		with np.load(snapshot_file) as snapshot:
+			if str(snapshot["source_hash"]) == source_hash:
+				return snapshot["stations"].tolist(), (snapshot["sources"], snapshot["targets"], snapshot["times"])
+	except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+		pass  # no usable snapshot
+
+	stations, (sources, targets, times) = read_sheet(data_file)
+	# Write into a temporary file and replace the snapshot with it, so that an
+	# interrupted run never leaves a partial snapshot behind.
+	try:
+		fd, staging = tempfile.mkstemp(suffix=".npz", dir=os.path.dirname(snapshot_file) or ".")
+	except OSError:
+		return stations, (sources, targets, times)  # a read-only directory only costs the next startup a parse
+	try:
+		with os.fdopen(fd, "wb") as file:
+			np.savez(file, source_hash=source_hash, stations=np.array(stations),
+					 sources=sources, targets=targets, times=times)
+		os.replace(staging, snapshot_file)
+	except OSError:
+		os.remove(staging)
+	return stations, (sources, targets, times)
+
+
+def unique_edges(edges, card_V, directed=True):
+	"""Return the edges with repeated connections removed, keeping the first
+	occurrence of each in the original order.  In an undirected network (u, v)
+	and (v, u) are the same connection."""
+	sources, targets, times = (np.asarray(column) for column in edges)
+	if directed:
+		keys = sources * card_V + targets
+	else:
+		keys = np.minimum(sources, targets) * card_V + np.maximum(sources, targets)
+	_, first = np.unique(keys, return_index=True)
+	first.sort()
+	return sources[first], targets[first], times[first]
+
+
+def insert_network_edges(G, edges):
+	"""Insert each connection of edges into graph G once.
+
+	Arguments:
+	G -- an empty weighted graph with one vertex per station
+	edges -- tuple (sources, targets, times) as returned by load_network
+	"""
+	sources, targets, times = unique_edges(edges, G.get_card_V(), G.is_directed())
+	for u, v, time in zip(sources.tolist(), targets.tolist(), times.tolist()):
+		G.insert_edge(u, v, time)
+
+
+# Testing
+if __name__ == "__main__":
+
+	import time
+	import pandas as pd
+	from adjacency_list_graph import AdjacencyListGraph
+
+	# Build the graph the way the task scripts used to, row by row.
+	start = time.perf_counter()
+	excel_data = pd.read_excel(DATA_FILE)
+	stations = sorted(set(excel_data["StationA"]).union(excel_data["StationB"]))
+	station_mapping = {station: i for i, station in enumerate(stations)}
+	row_graphs = []
+	for directed in (True, False):
+		graph = AdjacencyListGraph(len(stations), directed=directed, weighted=True)
+		for index, row in excel_data.iterrows():
+			u, v = station_mapping[row["StationA"]], station_mapping[row["StationB"]]
+			if not graph.has_edge(u, v):
+				graph.insert_edge(u, v, row["Time"])
+		row_graphs.append(graph)
+	print("Row by row: %.3f s" % (time.perf_counter() - start))
+
+	# Time a parse of the sheet, not a snapshot left by an earlier run.
+	if os.path.exists(snapshot_path(DATA_FILE)):
+		os.remove(snapshot_path(DATA_FILE))
+	for attempt in ("Parsing sheet", "From snapshot"):
+		start = time.perf_counter()
+		snapshot_stations, edges = load_network(DATA_FILE)
+		graphs = []
+		for directed in (True, False):
+			graph = AdjacencyListGraph(len(snapshot_stations), directed=directed, weighted=True)
+			insert_network_edges(graph, edges)
+			graphs.append(graph)
+		print("%s: %.3f s" % (attempt, time.perf_counter() - start))
+
+		print(snapshot_stations == stations and all(str(a) == str(b) for a, b in zip(graphs, row_graphs)))
+
+	# A corrupt snapshot is parsed over and replaced.
+	with open(snapshot_path(DATA_FILE), "wb") as file:
+		file.write(b"PK\x03\x04garbage")
+	snapshot_stations, edges = load_network(DATA_FILE)
+	with np.load(snapshot_path(DATA_FILE)) as snapshot:
+		print(snapshot_stations == stations and snapshot["stations"].tolist() == stations)
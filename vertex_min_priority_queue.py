@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# vertex_min_priority_queue.py
+
+"""Min-priority queue specialised for the vertices 0, 1, ..., n-1 of a graph."""
+
+
+class VertexMinPriorityQueue:
+
+    def __init__(self, keys):
+        """Initialize an empty min-priority queue over vertices 0 to len(keys) - 1.
+
+        Unlike MinHeapPriorityQueue, there is no key function or dictionary: the key
+        of vertex x is keys[x], the heap position of x is held in a list, keys are
+        compared directly, and the heap is restored by moving a hole up or down in a
+        loop instead of by recursive swaps.
+
+        Arguments:
+        keys -- list of vertex keys, shared with the caller, such as Dijkstra's d
+        """
+        self.keys = keys
+        self.heap = []
+        # position[x] is the index of vertex x in heap, or -1 if x is not in the queue.
+        self.position = [-1] * len(keys)
+
+    def get_size(self):
+        """Return the number of vertices in the priority queue."""
+        return len(self.heap)
+
+    def contains(self, x):
+        """Return True if vertex x is in the priority queue."""
+        return self.position[x] >= 0
+
+    def minimum(self):
+        """Return the vertex with the minimum key."""
+        if not self.heap:
+            raise RuntimeError("Heap underflow.")
+        return self.heap[0]
+
+    def insert(self, x):
+        """Insert vertex x with key keys[x]."""
+        if self.position[x] >= 0:
+            raise RuntimeError("Vertex " + str(x) + " is already in the priority queue.")
+        self.heap.append(x)
+        self.sift_up(len(self.heap) - 1, x)
+
+    def extract_min(self):
+        """Return and delete the vertex with the minimum key."""
+        heap = self.heap
+        if not heap:
+            raise RuntimeError("Heap underflow.")
+        top = heap[0]
+        last = heap.pop()
+        self.position[top] = -1
+        if heap:
+            self.sift_down(0, last)
+        return top
+
+    def decrease_key(self, x, k):
+        """Decrease the key of vertex x to k, setting keys[x] = k."""
+        if self.position[x] < 0:
+            raise RuntimeError("Vertex " + str(x) + " is not in the priority queue.")
+        if k > self.keys[x]:
+            raise RuntimeError("New key is larger than current key.")
+        self.keys[x] = k
+        self.sift_up(self.position[x], x)
+
+    def sift_up(self, i, x):
+        """Place vertex x at index i or above, moving larger parents down into the hole."""
+        heap, keys, position = self.heap, self.keys, self.position
+        key = keys[x]
+        while i > 0:
+            parent = (i - 1) // 2
+            y = heap[parent]
+            if keys[y] <= key:
+                break
+            heap[i] = y
+            position[y] = i
+            i = parent
+        heap[i] = x
+        position[x] = i
+
+    def sift_down(self, i, x):
+        """Place vertex x at index i or below, moving smaller children up into the hole."""
+        heap, keys, position = self.heap, self.keys, self.position
+        size = len(heap)
+        key = keys[x]
+        while True:
+            child = 2*i + 1
+            if child >= size:
+                break
+            # Choose the child with the smaller key.
+            if child + 1 < size and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            y = heap[child]
+            if keys[y] >= key:
+                break
+            heap[i] = y
+            position[y] = i
+            i = child
+        heap[i] = x
+        position[x] = i
+
+    def is_heap(self):
+        """Verify that the heap property and the position list both hold."""
+        for i, x in enumerate(self.heap):
+            if self.position[x] != i:
+                return False
+            if i > 0 and self.keys[self.heap[(i - 1) // 2]] > self.keys[x]:
+                return False
+        return True
+
+    def __str__(self):
+        """Return the heap as an array."""
+        return ", ".join(str(x) for x in self.heap)
+
+
+# Testing
+if __name__ == "__main__":
+
+    import random
+
+    keys = [random.randint(0, 100) for i in range(50)]
+    queue = VertexMinPriorityQueue(keys)
+    for x in range(50):
+        queue.insert(x)
+    print(queue.is_heap())
+    for x in random.sample(range(50), 20):
+        queue.decrease_key(x, keys[x] - random.randint(0, 50))
+    print(queue.is_heap())
+    extracted = [keys[queue.extract_min()] for i in range(50)]
+    print(extracted == sorted(keys))
+
+    # Decreasing the key of an extracted vertex must not touch the heap.
+    keys = [5, 3, 9, 1]
+    queue = VertexMinPriorityQueue(keys)
+    for x in range(4):
+        queue.insert(x)
+    x = queue.extract_min()
+    heap_before = list(queue.heap)
+    try:
+        queue.decrease_key(x, 0)
+        print("Extracted vertex accepted")
+    except RuntimeError as error:
+        print(error)
+    print(queue.heap == heap_before and queue.is_heap())